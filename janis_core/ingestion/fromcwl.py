@@ -11,9 +11,28 @@ import janis_core as j
 
 DEFAULT_PARSER_VERSION = "v1.2"
 
+_DASH_TABLE = str.maketrans({"-": "_"})
+_INT_RE = re.compile(r"^\s*\d+\s*$")
+_FLOAT_RE = re.compile(r"^\s*(?:\d*\.\d+|\d+\.\d*)\s*$")
+
+_CWL_PRIMITIVE = {
+    "File": j.File,
+    "Directory": j.Directory,
+    "string": j.String,
+    "int": j.Int,
+    "long": j.Int,
+    "float": j.Float,
+    "boolean": j.Boolean,
+    "stdout": j.Stdout,
+    "stderr": j.Stderr,
+    "Any": j.String,
+}
+
 
 class CWlParser:
 
+    # shared between parsers (from_doc creates one per document), only ever
+    # mutated in place or assigned on the class, never shadowed per instance
     parsed_cache = {}
     file_datatype_cache = {}
 
@@ -24,10 +43,8 @@ class CWlParser:
             cwl_version=cwl_version
         )
 
+    @classmethod
     def get_data_type_from_secondaries(cls, secondaries: List[str], optional: bool):
-        def calcluate_hash_of_set(s):
-            return hash("|".join(sorted(set(s))))
-
         if not cls.file_datatype_cache:
 
             FastaGzType = None
@@ -38,40 +55,46 @@ class CWlParser:
             except ImportError:
                 pass
             dts = j.JanisShed.get_all_datatypes()
-            cls.file_datatype_cache = {
-                calcluate_hash_of_set(dt.secondary_files()): dt
+            file_dts = (
+                (dt, dt().secondary_files())
                 for dt in dts
                 if issubclass(dt, j.File)
-                and dt().secondary_files()
                 and (FastaGzType is not None and not issubclass(dt, FastaGzType))
+            )
+            cls.file_datatype_cache = {
+                frozenset(secs): dt for dt, secs in file_dts if secs
             }
 
-        sec_hash = calcluate_hash_of_set(secondaries)
-        if sec_hash in cls.file_datatype_cache:
-            return cls.file_datatype_cache[sec_hash](optional=optional)
+        dt = cls.file_datatype_cache.get(frozenset(secondaries))
+        if dt is not None:
+            return dt(optional=optional)
 
         return j.GenericFileWithSecondaries(secondaries=secondaries)
 
     @staticmethod
     def from_doc(doc: str, base_uri=None):
-        abs_path = os.path.relpath(doc)
-
-        if abs_path in CWlParser.parsed_cache:
-            return CWlParser.parsed_cache[abs_path]
-
-        initial = None
+        if doc.startswith("file://"):
+            doc = doc[7:]
         if base_uri:
             if base_uri.startswith("file://"):
-                base_uri = base_uri[6:]
-            initial = os.getcwd()
-            os.chdir(base_uri)
-        cwl_version = CWlParser.load_cwl_version_from_doc(doc)
-        parser = CWlParser(cwl_version=cwl_version, base_uri=os.path.dirname(doc))
-
-        tool = parser.from_document(doc)
-        CWlParser.parsed_cache[abs_path] = tool
-        if initial:
-            os.chdir(initial)
+                base_uri = base_uri[7:]
+            # resolve against the base_uri rather than changing the process CWD,
+            # os.path.join is a no-op if the doc is already absolute
+            doc = os.path.join(base_uri, doc)
+
+        abs_path = os.path.abspath(doc)
+        # symlinks resolved so the same document is only parsed once, but still
+        # loaded through abs_path so its relative references resolve as written
+        cache_key = os.path.realpath(abs_path)
+
+        if cache_key in CWlParser.parsed_cache:
+            return CWlParser.parsed_cache[cache_key]
+
+        cwl_version = CWlParser.load_cwl_version_from_doc(abs_path)
+        parser = CWlParser(cwl_version=cwl_version, base_uri=os.path.dirname(abs_path))
+
+        tool = parser.from_document(abs_path)
+        CWlParser.parsed_cache[cache_key] = tool
         return tool
 
     def from_document(self, doc):
@@ -115,32 +138,13 @@ class CWlParser:
         if isinstance(cwl_type, str):
             optional = "?" in cwl_type
             cwl_type = cwl_type.replace("?", "")
-            array_count = 0
-            while cwl_type.endswith("[]"):
-                array_count += 1
-                cwl_type = cwl_type[:-2]
-
-            if cwl_type == "File":
-                inner = j.File
-            elif cwl_type == "Directory":
-                inner = j.Directory
-            elif cwl_type == "string":
-                inner = j.String
-            elif cwl_type == "int":
-                inner = j.Int
-            elif cwl_type == "float":
-                inner = j.Float
-            elif cwl_type == "boolean":
-                inner = j.Boolean
-            elif cwl_type == "stdout":
-                inner = j.Stdout
-            elif cwl_type == "stderr":
-                inner = j.Stderr
-            elif cwl_type == "Any":
-                inner = j.String
-            elif cwl_type == "long":
-                inner = j.Int
-            else:
+            # only count the trailing "[]" pairs, in one pass
+            array_count = (len(cwl_type) - len(cwl_type.rstrip("[]"))) >> 1
+            if array_count:
+                cwl_type = cwl_type[: -2 * array_count]
+
+            inner = _CWL_PRIMITIVE.get(cwl_type)
+            if inner is None:
                 raise Exception(f"Can't detect type {cwl_type}")
             return inner(optional=optional)
 
@@ -198,8 +202,7 @@ class CWlParser:
         identifier = cls.get_source_from_identifier(identifier)
         if "/" in identifier:
             identifier = str(identifier.split("/")[-1])
-        while "-" in identifier:
-            identifier = identifier.replace("-", "_")
+        identifier = identifier.translate(_DASH_TABLE)
 
         if identifier == "input":
             return "inp"
@@ -215,8 +218,7 @@ class CWlParser:
         if "#" in identifier:
             identifier = str(identifier.split("#")[-1])
 
-        while "-" in identifier:
-            identifier = identifier.replace("-", "_")
+        identifier = identifier.translate(_DASH_TABLE)
 
         if identifier == "input":
             return "inp"
@@ -234,10 +236,9 @@ class CWlParser:
             for s in secondary_files
         ]
 
-    function_token_matcher = re.compile(
-        "^\$\{\s*?return\s+?(.+?);*?\s*?\}$"
-    )  # ${ return "arriba" }
-    single_token_matcher = re.compile("^\$\((.+)\)$")  # "$(some value here)"
+    whole_token_matcher = re.compile(
+        r"^(?:\$\((?P<single>.+)\)|\$\{\s*?return\s+?(?P<function>.+?);*?\s*?\})$"
+    )  # "$(some value here)" | ${ return "arriba" }
     inline_expression_matcher = re.compile(
         "\$\((.+?)\)"
     )  # valueFrom: "Hello, my name is $(name)
@@ -255,9 +256,9 @@ class CWlParser:
         """
         if not isinstance(num, str):  # optional - check type
             raise TypeError("num should be a str. Got {}.".format(type(num)))
-        if re.compile("^\s*\d+\s*$").search(num):
+        if _INT_RE.match(num):
             return int(num)
-        if re.compile("^\s*(\d*\.\d+)|(\d+\.\d*)\s*$").search(num):
+        if _FLOAT_RE.match(num):
             return float(num)
         raise ValueError("num is not a number. Got {}.".format(num))  # optional
 
@@ -266,21 +267,21 @@ class CWlParser:
             return None
         if not isinstance(expr, str):
             return expr
-        match = self.single_token_matcher.match(expr)
+        if "$" not in expr:
+            # plain string, none of the expression matchers can match
+            return expr
+        match = self.whole_token_matcher.match(expr)
         if match:
-            return self.convert_javascript_token(match.groups()[0])
+            return self.convert_javascript_token(match.group(match.lastgroup))
 
-        bigger_match = self.function_token_matcher.match(expr)
-        if bigger_match:
-            return self.convert_javascript_token(bigger_match.groups()[0])
+        # dict.fromkeys dedupes but keeps the order the tokens appear in
+        tokens = dict.fromkeys(self.inline_expression_matcher.findall(expr))
 
-        tokens = set(self.inline_expression_matcher.findall(expr))
-
-        string_format = f"{expr}"
+        string_format = expr
         token_replacers = {}
 
-        for token, idx in zip(tokens, range(len(tokens))):
-            key = f"JANIS_CWL_TOKEN_{idx+1}"
+        for idx, token in enumerate(tokens, 1):
+            key = f"JANIS_CWL_TOKEN_{idx}"
             string_format = string_format.replace(f"$({token})", f"{{{key}}}")
             token_replacers[key] = self.convert_javascript_token(token)
 
@@ -405,21 +406,20 @@ class CWlParser:
         if not isinstance(step_input, str):
             raise Exception(f"Can't parse step_input {step_input}")
 
-        parsed_step_input = self.get_source_from_identifier(step_input)
-        if parsed_step_input.startswith(wf.id() + "/"):
-            parsed_step_input = parsed_step_input[len(wf.id()) + 1 :]
-        if potential_prefix and parsed_step_input.startswith(potential_prefix + "/"):
-            parsed_step_input = parsed_step_input[len(potential_prefix) + 1 :]
+        # split once, then strip the workflow / step prefixes off the front
+        parts = self.get_source_from_identifier(step_input).split("/")
+        if len(parts) > 1 and parts[0] == wf.id():
+            del parts[0]
+        if potential_prefix and len(parts) > 1 and parts[0] == potential_prefix:
+            del parts[0]
 
-        if parsed_step_input.startswith("$("):
+        if parts[0].startswith("$("):
             raise Exception(
                 f"This script can't parse expressions in the step input {step_input}"
             )
 
-        [*ignore, source_str, tag_str] = (
-            parsed_step_input.split("/")
-            if "/" in parsed_step_input
-            else (parsed_step_input, None)
+        source_str, tag_str = (
+            (parts[-2], parts[-1]) if len(parts) > 1 else (parts[0], None)
         )
 
         tag_str = self.get_tag_from_identifier(tag_str)
@@ -466,24 +466,12 @@ class CWlParser:
         else:
             tool = CWlParser.from_doc(stp.run, base_uri=self.base_uri)
 
-        inputs = {}
-        for inp in stp.in_:
-            inp: cwlgen.WorkflowStepInput = inp
-            inp_identifier = self.get_tag_from_identifier(inp.id)
-
-            source = None
-            if inp.source is not None:
-                source = self.parse_workflow_source(
-                    wf, inp.source, potential_prefix=step_identifier
-                )
-            elif inp.valueFrom is not None:
-                source = self.parse_basic_expression(inp.valueFrom)
-            elif inp.default:
-                source = inp.default
-
-            if source is None:
-                print(f"Source is None from object: {inp.save()}")
-            inputs[inp_identifier] = source
+        inputs = {
+            self.get_tag_from_identifier(inp.id): self.resolve_step_input_source(
+                wf, inp, step_identifier
+            )
+            for inp in stp.in_
+        }
 
         scatter = None
         if stp.scatter:
@@ -509,6 +497,22 @@ class CWlParser:
             doc=stp.doc,
         )
 
+    def resolve_step_input_source(self, wf: j.Workflow, inp, step_identifier: str):
+        # inp: cwlgen.WorkflowStepInput
+        source = None
+        if inp.source is not None:
+            source = self.parse_workflow_source(
+                wf, inp.source, potential_prefix=step_identifier
+            )
+        elif inp.valueFrom is not None:
+            source = self.parse_basic_expression(inp.valueFrom)
+        elif inp.default:
+            source = inp.default
+
+        if source is None:
+            print(f"Source is None from object: {inp.save()}")
+        return source
+
     def ingest_scatter_method(self, scatter_method) -> j.ScatterMethod:
         if scatter_method is None or scatter_method == "":
             return None
@@ -640,7 +644,17 @@ class CWlParser:
         if doc.startswith("file://"):
             doc = doc[7:]
         with open(doc) as fp:
-            tool_dict = ruamel.yaml.load(fp, Loader=ruamel.yaml.Loader)
+            # fast path: the top-level cwlVersion line, without building the document
+            for line in fp:
+                if line.startswith("cwlVersion"):
+                    _, _, version = line.partition(":")
+                    version = version.split("#")[0].strip().strip("'\"")
+                    if version:
+                        return version
+                    break
+
+            fp.seek(0)
+            tool_dict = ruamel.yaml.YAML(typ="safe").load(fp)
 
         if "cwlVersion" not in tool_dict:
             raise Exception(f"Couldn't find cwlVersion in tool {doc}")
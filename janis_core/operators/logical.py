@@ -25,11 +25,12 @@ from .operator import Selector, Operator, SingleValueOperator, TwoValueOperator
 def or_prev_conds(prevconditions: List[Operator]):
     if len(prevconditions) == 0:
         return None
-    elif len(prevconditions) == 1:
-        return prevconditions[0]
-    elif len(prevconditions) == 2:
-        return OrOperator(prevconditions[0], prevconditions[1])
-    return OrOperator(prevconditions[0], or_prev_conds(prevconditions[1:]))
+    # fold from the right, keeping the nesting of (a or (b or c)) without
+    # slicing the list for every level
+    cond = prevconditions[-1]
+    for prevcondition in reversed(prevconditions[:-1]):
+        cond = OrOperator(prevcondition, cond)
+    return cond
 
 
 class IsDefined(Operator, ABC):
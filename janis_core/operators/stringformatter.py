@@ -1,3 +1,5 @@
+import re
+import sys
 from typing import Optional, List, Dict, Tuple
 
 from janis_core.utils import first_value
@@ -13,6 +15,13 @@ from janis_core.utils.errors import (
 )
 from janis_core.utils.logger import Logger
 
+# shared by every formatter, for both __repr__ and building the format template
+_PLACEHOLDER_RE = re.compile(r"\{(\w+)\}")
+
+
+def _escape_braces(text: str) -> str:
+    return text.replace("{", "{{").replace("}", "}}")
+
 
 class StringFormatter(Operator):
     def returntype(self):
@@ -34,13 +43,18 @@ class StringFormatter(Operator):
         self._format: str = format
 
         keywords, balance = get_keywords_between_braces(self._format)
+        # cached, so resolving / concatenating doesn't need to parse the format again
+        self._keywords: set = keywords
+        self._balance: int = balance
+        # built on first resolve, see _get_format_template
+        self._format_template: Optional[str] = None
 
         if balance > 0:
             Logger.warn(
                 "There was an imbalance of braces in the string _format, this might cause issues with concatenation"
             )
 
-        skwargs = set(kwargs.keys())
+        skwargs = kwargs.keys()
 
         if not keywords == skwargs:
             # what's the differences
@@ -55,9 +69,13 @@ class StringFormatter(Operator):
                     + ", ".join(skwargs - keywords)
                 )
 
-        self.kwargs = kwargs
+        # interned, so comparing the same strings between formatters (eg: in __add__)
+        # short circuits on identity
+        self.kwargs = {
+            k: sys.intern(v) if type(v) is str else v for k, v in kwargs.items()
+        }
 
-    resolved_types = [str, int, float]
+    resolved_types = (str, int, float)
 
     def to_cwl(self, unwrap_operator, *args):
         raise Exception("Don't use this method")
@@ -149,26 +167,38 @@ class StringFormatter(Operator):
         return combinations
 
     def __repr__(self):
-        val = self._format
-        for k, v in self.kwargs.items():
-            val = val.replace(f"{{{k}}}", f"{{{str(v)}}}")
-        return val
+        kwargs = self.kwargs
+
+        def replace_placeholder(match):
+            k = match.group(1)
+            return f"{{{kwargs[k]!s}}}" if k in kwargs else match.group(0)
+
+        return _PLACEHOLDER_RE.sub(replace_placeholder, self._format)
 
     def get_leaves(self):
+        # walk nested formatters with a stack of iterators rather than recursing,
+        # other operators still collect their own leaves
         leaves = []
-        for a in self.kwargs.values():
-            if isinstance(a, Operator):
-                leaves.extend(a.get_leaves())
+        stack = [iter(self.kwargs.values())]
+        while stack:
+            for a in stack[-1]:
+                if isinstance(a, StringFormatter):
+                    stack.append(iter(a.kwargs.values()))
+                    break
+                elif isinstance(a, Operator):
+                    leaves.extend(a.get_leaves())
+                else:
+                    leaves.append(a)
             else:
-                leaves.append(a)
+                stack.pop()
         return leaves
 
     def resolve_with_resolved_values(self, **resolved_values):
 
-        s1 = set(self.kwargs.keys())
-        actual_keys, _ = get_keywords_between_braces(self._format)
+        s1 = self.kwargs.keys()
+        actual_keys = self._keywords
         if s1 != actual_keys:
-            diff = (actual_keys - s1).union(s1 - actual_keys)
+            diff = actual_keys ^ s1
 
             raise Exception(
                 "The format for the string builder has changed since runtime, or an internal error has"
@@ -176,9 +206,7 @@ class StringFormatter(Operator):
                 + ", ".join(diff)
             )
 
-        s2 = set(resolved_values.keys())
-
-        missing_keys = s1 - s2
+        missing_keys = s1 - resolved_values.keys()
         if len(missing_keys) > 0:
             raise IncorrectArgsException(
                 "There were missing parameters when formatting string: "
@@ -186,12 +214,9 @@ class StringFormatter(Operator):
             )
 
         unresolved_values = [
-            f"{r} ({type(resolved_values[r]).__name__})"
-            for r in resolved_values
-            if not any(
-                isinstance(resolved_values[r], t)
-                for t in StringFormatter.resolved_types
-            )
+            f"{r} ({type(v).__name__})"
+            for r, v in resolved_values.items()
+            if not isinstance(v, StringFormatter.resolved_types)
         ]
         if len(unresolved_values) > 0:
             raise ValueError(
@@ -199,10 +224,26 @@ class StringFormatter(Operator):
                 + ", ".join(unresolved_values)
             )
 
-        retval = self._format
-        for k in resolved_values:
-            retval = retval.replace(f"{{{k}}}", str(resolved_values[k]))
-        return retval
+        return self._get_format_template().format_map(
+            {k: str(v) for k, v in resolved_values.items()}
+        )
+
+    def _get_format_template(self) -> str:
+        """
+        The _format as a str.format template, so it can be resolved in a single pass:
+        every brace is escaped except for those around our keywords.
+        """
+        if self._format_template is None:
+            fmt, parts, last = self._format, [], 0
+            for match in _PLACEHOLDER_RE.finditer(fmt):
+                if match.group(1) not in self._keywords:
+                    continue
+                parts.append(_escape_braces(fmt[last : match.start()]))
+                parts.append(match.group(0))
+                last = match.end()
+            parts.append(_escape_braces(fmt[last:]))
+            self._format_template = "".join(parts)
+        return self._format_template
 
     def __radd__(self, other):
         return StringFormatter(other) + self
@@ -211,17 +252,11 @@ class StringFormatter(Operator):
         from janis_core.operators.selectors import InputSelector
 
         if isinstance(other, str):
-            # check if it has args in it
-            keywords = get_keywords_between_braces(other)
-            if len(keywords) > 0:
-                invalidkwargs = [k for k in self.kwargs if k not in self.kwargs]
-                if len(invalidkwargs) > 0:
-                    raise InvalidByProductException(
-                        f"The string to be concatenated contained placeholder(s) ({', '.join(invalidkwargs)})"
-                        f"that were not in the original StringFormatter"
-                    )
-            return self._create_new_formatter_from_strings_and_args(
-                [self._format, other], **self.kwargs
+            # any placeholders are checked on the joined format (a trailing '$' can
+            # turn a leading '{x}' into a literal '${x}'), see _concat_with_known_keywords
+            keywords, balance = get_keywords_between_braces(other)
+            return self._concat_with_known_keywords(
+                other, keywords, balance, self.kwargs
             )
 
         elif isinstance(other, InputSelector):
@@ -229,9 +264,7 @@ class StringFormatter(Operator):
 
         elif isinstance(other, StringFormatter):
             # check if args overlap and they're different
-            s1 = set(self.kwargs.keys())
-            s2 = set(other.kwargs.keys())
-            intersection = s1.intersection(s2)
+            intersection = self.kwargs.keys() & other.kwargs.keys()
 
             if len(intersection) > 0:
                 not_same_args = [
@@ -245,23 +278,67 @@ class StringFormatter(Operator):
 
             # yeah we sweet
             new_args = {**self.kwargs, **other.kwargs}
-            return StringFormatter._create_new_formatter_from_strings_and_args(
-                [self._format, other._format], **new_args
+            return self._concat_with_known_keywords(
+                other._format, other._keywords, other._balance, new_args
             )
 
+    def _concat_with_known_keywords(
+        self, other_format: str, other_keywords: set, other_balance: int, kwargs: dict
+    ):
+        """
+        Join our format with another whose keywords are already known. If all our braces
+        are closed (and the join doesn't make a '${'), the joined keywords are just the
+        union, so the new formatter doesn't need to parse the whole format again.
+        """
+        keywords = self._keywords | other_keywords
+        if (
+            self._balance == 0
+            and not (self._format.endswith("$") and other_format.startswith("{"))
+            and keywords == kwargs.keys()
+        ):
+            return StringFormatter._from_prevalidated(
+                self._format + other_format, keywords, other_balance, kwargs
+            )
+
+        return StringFormatter._create_new_formatter_from_strings_and_args(
+            [self._format, other_format], **kwargs
+        )
+
+    @classmethod
+    def _from_prevalidated(cls, format: str, keywords: set, balance: int, kwargs: dict):
+        sf = cls.__new__(cls)
+        super(StringFormatter, sf).__init__([])
+        sf._format = format
+        sf._keywords = keywords
+        sf._balance = balance
+        sf._format_template = None
+        if balance > 0:
+            Logger.warn(
+                "There was an imbalance of braces in the string _format, this might cause issues with concatenation"
+            )
+        # kwargs come from (already interned) formatters, but might be one's own dict
+        sf.kwargs = dict(kwargs)
+        return sf
+
     @staticmethod
     def _create_new_formatter_from_strings_and_args(strings: [str], **kwargs):
         new_format = "".join(strings)
-        try:
-            return StringFormatter(new_format, **kwargs)
-        except IncorrectArgsException as e:
-            new_params = set(
-                get_keywords_between_braces(new_format)[0] - set(kwargs.keys())
+        # parse once here, and build the formatter from the result
+        keywords, balance = get_keywords_between_braces(new_format)
+        if keywords == kwargs.keys():
+            return StringFormatter._from_prevalidated(
+                new_format, keywords, balance, kwargs
             )
+
+        new_params = keywords - kwargs.keys()
+        if new_params:
             raise InvalidByProductException(
-                "Joining the input files (to '{new_format}') created the new params: "
+                f"Joining the input files (to '{new_format}') created the new params: "
                 + ", ".join(new_params)
             )
 
+        # raises the TooManyArgsException
+        return StringFormatter(new_format, **kwargs)
+
     def to_string_formatter(self):
         return self
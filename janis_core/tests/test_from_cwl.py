@@ -58,3 +58,15 @@ class TestFromCwlExpressions(unittest.TestCase):
         self.assertIsInstance(result, ReadContents)
         self.assertIsInstance(result.args[0], InputSelector)
         self.assertEqual("my_input", result.args[0].input_to_select)
+
+
+class TestFromCwlTypes(unittest.TestCase):
+    def test_cached_type_not_shared(self):
+        parser = CWlParser(cwl_version="v1.2")
+        cwl_type = parser.cwlgen.InputArraySchema(items="File", type="array")
+        first = parser.ingest_cwl_type(cwl_type, None)
+        first.subtype().optional = True
+
+        second = parser.ingest_cwl_type(cwl_type, None)
+        self.assertIsNot(first, second)
+        self.assertFalse(second.subtype().optional)
@@ -63,6 +63,11 @@ class TestBraceDetection(unittest.TestCase):
         self.assertEqual(1, len(res))
         self.assertSetEqual({"first"}, res)
 
+    def test_leading_group_with_trailing_dollar(self):
+        k = "{price} in $"
+        res, _ = get_keywords_between_braces(k)
+        self.assertSetEqual({"price"}, res)
+
 
 class TestMatchDetectionAndValidation(unittest.TestCase):
     # Use cases from: https://stackoverflow.com/a/36331242/2860731
@@ -196,6 +201,29 @@ class TestStringFormatterConcat(unittest.TestCase):
         self.assertEqual("one {arg} + another {arg}", b._format)
         self.assertEqual(1, len(b.kwargs))
 
+    def test_concat_keeps_keywords(self):
+        b = StringFormatter("{a}-", a="x") + StringFormatter("{b}.txt", b="y")
+        self.assertEqual("{a}-{b}.txt", b._format)
+        self.assertSetEqual({"a", "b"}, b._keywords)
+        self.assertEqual("x-y.txt", b.resolve_with_resolved_values(a="x", b="y"))
+
+    def test_concat_dollar_brace(self):
+        # joining makes "${b}", which isn't a placeholder
+        with self.assertRaises(TooManyArgsException):
+            StringFormatter("{a} $", a="x") + StringFormatter("{b}", b="y")
+
+    def test_concat_dollar_brace_string(self):
+        self.assertEqual("pre${x}", (StringFormatter("pre$") + "{x}")._format)
+
+        # joining makes "${b}" (not a placeholder), so the string is valid here
+        b = StringFormatter("{a} $", a="x") + "{b}"
+        self.assertEqual("{a} ${b}", b._format)
+        self.assertSetEqual({"a"}, b._keywords)
+
+    def test_concat_string_unknown_placeholder(self):
+        with self.assertRaises(InvalidByProductException):
+            StringFormatter("{a}-", a="x") + "{b}.txt"
+
     def test_reverse_add(self):
         b = "Hello, " + StringFormatter("world")
         self.assertEqual("Hello, world", b._format)
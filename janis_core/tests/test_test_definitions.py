@@ -0,0 +1,154 @@
+from datetime import datetime
+from unittest import TestCase, mock
+
+from janis_core import CommandToolBuilder, ToolInput, ToolOutput, String, Stdout
+from janis_core.tool.test_definitions import ToolEvaluator
+from janis_core.utils.errors import MissingDependencyException
+from janis_core.utils.metadata import ToolMetadata
+
+
+def build_tool(
+    tool="evaluatorTestTool",
+    container="ubuntu:latest",
+    version="v0.1.0",
+    friendly_name="Evaluator test tool",
+):
+    t = CommandToolBuilder(
+        tool=tool,
+        friendly_name=friendly_name,
+        base_command="echo",
+        inputs=[ToolInput("inp", String, position=1)],
+        outputs=[ToolOutput("out", Stdout)],
+        container=container,
+        version=version,
+        tool_module="unix",
+    )
+    t.metadata = ToolMetadata(
+        contributors=["Janis"],
+        dateCreated=datetime(2020, 1, 1),
+        institution="Janis",
+    )
+    return t
+
+
+def found_digests(containers):
+    # the "missing" image has no digest, so the registry just echoes its tag
+    return {
+        c: c if c.startswith("missing") else f"{c.split(':')[0]}@sha256:abc"
+        for c in containers
+    }
+
+
+def failing_translation(tool):
+    if tool.id() == "untranslatable":
+        return "cwl: translation failed"
+    return True
+
+
+@mock.patch.object(ToolEvaluator, "_get_container_digests", side_effect=found_digests)
+@mock.patch.object(ToolEvaluator, "_evaluate_translation", return_value=True)
+class TestToolEvaluatorTranslation(TestCase):
+    def test_same_tool_translated_once(self, mock_translation, mock_digests):
+        tool = build_tool()
+        ToolEvaluator.evaluate_many([tool, tool])
+        self.assertEqual(1, mock_translation.call_count)
+
+    def test_changed_tool_translated_again(self, mock_translation, mock_digests):
+        tool = build_tool()
+        ToolEvaluator.evaluate_many([tool])
+
+        tool._base_command = "printf"
+        ToolEvaluator.evaluate_many([tool])
+        self.assertEqual(2, mock_translation.call_count)
+
+    def test_tools_sharing_an_id_translated_separately(
+        self, mock_translation, mock_digests
+    ):
+        ToolEvaluator.evaluate_many([build_tool(), build_tool()])
+        self.assertEqual(2, mock_translation.call_count)
+
+
+@mock.patch.object(ToolEvaluator, "_get_container_digests", side_effect=found_digests)
+@mock.patch.object(
+    ToolEvaluator, "_evaluate_translation", side_effect=failing_translation
+)
+class TestToolEvaluatorEvaluateMany(TestCase):
+    def test_skipped_tool(self, mock_translation, mock_digests):
+        tool = build_tool()
+        tool.skip_test = lambda: True
+
+        self.assertDictEqual(
+            {tool.versioned_id(): ToolEvaluator.STATUS_SKIPPED},
+            ToolEvaluator.evaluate_many([tool]),
+        )
+        mock_translation.assert_not_called()
+
+    def test_containers_looked_up_once(self, mock_translation, mock_digests):
+        ToolEvaluator.evaluate_many(
+            [
+                build_tool(tool="toolOne", container="ubuntu:latest"),
+                build_tool(tool="toolTwo", container="ubuntu:latest"),
+                build_tool(tool="toolThree", container="python:3.8"),
+            ]
+        )
+        mock_digests.assert_called_once_with(["ubuntu:latest", "python:3.8"])
+
+    def test_matches_evaluate(self, mock_translation, mock_digests):
+        tools = [
+            build_tool(tool="valid"),
+            build_tool(tool="unnamed", friendly_name=None),
+            build_tool(tool="missingContainer", container="missing:latest"),
+            build_tool(tool="untranslatable", friendly_name=None),
+        ]
+
+        results = ToolEvaluator.evaluate_many(tools)
+        self.assertDictEqual(
+            {t.versioned_id(): ToolEvaluator.evaluate(t) for t in tools}, results
+        )
+        self.assertEqual(
+            "Missing friendly name; cwl: translation failed",
+            results[tools[3].versioned_id()],
+        )
+
+    def test_tool_without_container(self, mock_translation, mock_digests):
+        tool = build_tool(container=None)
+        self.assertDictEqual(
+            {tool.versioned_id(): True}, ToolEvaluator.evaluate_many([tool])
+        )
+
+
+@mock.patch.object(ToolEvaluator, "_get_container_digests", side_effect=found_digests)
+@mock.patch.object(
+    ToolEvaluator, "_evaluate_translation", side_effect=failing_translation
+)
+class TestToolEvaluatorGeneric(TestCase):
+    def test_evaluation(self, mock_translation, mock_digests):
+        tool = build_tool(
+            tool="untranslatable", container="missing:latest", friendly_name=None
+        )
+        evaluation = ToolEvaluator.evaluate_generic(tool)
+
+        self.assertListEqual(
+            ["friendly_name", "tool_module", "metadata", "container", "translation"],
+            list(evaluation.keys()),
+        )
+        self.assertDictEqual(
+            {
+                "friendly_name": "Missing friendly name",
+                "tool_module": True,
+                "metadata": True,
+                "container": "container missing:latest not found",
+                "translation": "cwl: translation failed",
+            },
+            evaluation,
+        )
+
+    def test_container_check_raises(self, mock_translation, mock_digests):
+        mock_digests.side_effect = MissingDependencyException("no janis_assistant")
+        with self.assertRaises(MissingDependencyException):
+            ToolEvaluator.evaluate_generic(build_tool())
+
+    def test_translation_check_raises(self, mock_translation, mock_digests):
+        mock_translation.side_effect = ValueError("unexpected")
+        with self.assertRaises(ValueError):
+            ToolEvaluator.evaluate_generic(build_tool())
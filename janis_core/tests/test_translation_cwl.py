@@ -1,3 +1,6 @@
+import hashlib
+import os
+import tempfile
 import unittest
 from typing import List, Dict, Any, Optional
 
@@ -56,6 +59,50 @@ class TestCwlTypesConversion(unittest.TestCase):
     pass
 
 
+class TestCwlResourceOverrideGrouping(unittest.TestCase):
+    def test_group_by_step(self):
+        ids = [
+            "stp_runtime_cpu",
+            "stp_two_runtime_cpu",
+            "sub_inner_runtime_memory",
+            "stpx_runtime_cpu",
+        ]
+        resource_inputs = [
+            cwlgen.WorkflowInputParameter(id=i, type="int?") for i in ids
+        ]
+
+        grouped = cwl.group_resource_overrides_by_step(
+            resource_inputs, ["stp", "stp_two", "sub"]
+        )
+
+        self.assertDictEqual(
+            {
+                "stp": {
+                    "runtime_cpu": "stp_runtime_cpu",
+                    "two_runtime_cpu": "stp_two_runtime_cpu",
+                },
+                "stp_two": {"runtime_cpu": "stp_two_runtime_cpu"},
+                "sub": {"inner_runtime_memory": "sub_inner_runtime_memory"},
+            },
+            grouped,
+        )
+
+
+class TestCwlFormatCache(unittest.TestCase):
+    def test_reads_formatted_document_from_cache(self):
+        unformatted = "#!/usr/bin/env cwl-runner\nclass: Workflow\n"
+        with tempfile.TemporaryDirectory() as d:
+            key = hashlib.sha256(unformatted.encode()).hexdigest()
+            with open(os.path.join(d, key + ".cwl"), "w+") as f:
+                f.write("cached")
+
+            CwlTranslator.format_cache_dir = d
+            try:
+                self.assertEqual("cached", CwlTranslator.format_cwl(unformatted))
+            finally:
+                CwlTranslator.format_cache_dir = None
+
+
 class TestCwlMisc(unittest.TestCase):
     def test_str_tool(self):
         t = TestTool()
@@ -869,6 +916,81 @@ class TestCWLRunRefs(unittest.TestCase):
         self.assertEqual("tools/TestTranslationtool.cwl", stps["stp1"].run)
         self.assertEqual("tools/TestTranslationtool_v0_0_2.cwl", stps["stp2"].run)
 
+    def test_collect_leaf_tools(self):
+        inner = WorkflowBuilder("innerWorkflow")
+        inner.input("inp", str)
+        inner.step("stp", TestToolV2(testtool=inner.inp))
+        inner.output("out", source=inner.stp.std)
+
+        w = WorkflowBuilder("testCollectLeafTools")
+        w.input("inp", str)
+        w.step("sub", inner(inp=w.inp))
+        w.step("stp", TestTool(testtool=w.inp))
+
+        self.assertListEqual(
+            ["TestTranslationtool_v0_0_2", "TestTranslationtool"],
+            list(cwl.collect_leaf_tools(w).keys()),
+        )
+
+    def test_parallel_matches_serial(self):
+        inner = WorkflowBuilder("innerWorkflow")
+        inner.input("inp", str)
+        inner.step("stp", TestToolV2(testtool=inner.inp))
+        inner.output("out", source=inner.stp.std)
+
+        echo = CommandToolBuilder(
+            tool="echoBuilder",
+            base_command="echo",
+            inputs=[ToolInput("inp", String, position=1)],
+            outputs=[ToolOutput("out", Stdout)],
+            container=None,
+            version="v0.1.0",
+        )
+
+        w = WorkflowBuilder("testParallelMatchesSerial")
+        w.input("inp", str)
+        w.step("sub", inner(inp=w.inp))
+        w.step("stp", TestTool(testtool=w.inp))
+        w.step("echo", echo(inp=w.inp))
+        w.output("out", source=w.echo.out)
+
+        wf_serial, tools_serial = CwlTranslator.translate_workflow(
+            w, with_container=False
+        )
+        wf_parallel, tools_parallel = CwlTranslator.translate_workflow(
+            w, with_container=False, parallel=True
+        )
+
+        stringify = CwlTranslator.stringify_translated_workflow
+        self.assertEqual(stringify(wf_serial), stringify(wf_parallel))
+        self.assertListEqual(list(tools_serial.keys()), list(tools_parallel.keys()))
+        for k, tool_serial in tools_serial.items():
+            self.assertEqual(stringify(tool_serial), stringify(tools_parallel[k]))
+
+    def test_shared_tool_translated_once(self):
+        inner1 = WorkflowBuilder("innerWorkflowOne")
+        inner1.input("inp", str)
+        inner1.step("stp", TestTool(testtool=inner1.inp))
+        inner1.output("out", source=inner1.stp.std)
+
+        inner2 = WorkflowBuilder("innerWorkflowTwo")
+        inner2.input("inp", str)
+        inner2.step("stp", TestTool(testtool=inner2.inp))
+        inner2.output("out", source=inner2.stp.std)
+
+        w = WorkflowBuilder("testSharedToolAcrossSubworkflows")
+        w.input("inp", str)
+        w.step("sub1", inner1(inp=w.inp))
+        w.step("sub2", inner2(inp=w.inp))
+        w.step("stp3", TestTool(testtool=w.inp))
+
+        _, tools = CwlTranslator.translate_workflow(w, with_container=False)
+
+        self.assertSetEqual(
+            {"innerWorkflowOne", "innerWorkflowTwo", "TestTranslationtool"},
+            set(tools.keys()),
+        )
+
 
 class TestCwlResourceOperators(unittest.TestCase):
     def test_1(self):
@@ -37,6 +37,14 @@ class TestTypes(unittest.TestCase):
         subtype = DataTypeWithSecondary()
         self.assertRaises(Exception, Stdout, subtype)
 
+    def test_as_optional(self):
+        ar = Array(String())
+        opt = ar.as_optional()
+        self.assertIsInstance(opt, Array)
+        self.assertTrue(opt.optional)
+        self.assertFalse(ar.optional)
+        self.assertEqual("Optional<Array<String>>", opt.id())
+
 
 class TestParseTypes(unittest.TestCase):
     def test_parse_primitive_str(self):
@@ -5,6 +5,7 @@ from janis_core.types import Boolean
 
 from janis_core import (
     File,
+    StringFormatter,
     Array,
     Logger,
     String,
@@ -14,6 +15,7 @@ from janis_core import (
 )
 from janis_core.graph.steptaginput import StepTagInput, first_value, Edge
 from janis_core.tests.testtools import SingleTestTool, ArrayTestTool
+from janis_core.workflow.workflow import SwitchConditionRebuilder
 
 
 class TestWorkflow(TestCase):
@@ -286,6 +288,94 @@ class TestWorkflow(TestCase):
         self.assertTrue(w.has_multiple_inputs)
         self.assertTrue(e.compatible_types)
 
+    def test_conditional_step_outputs_optional(self):
+        w = WorkflowBuilder("test_conditional_step_outputs_optional")
+        w.input("inp", String())
+        w.input("run", Boolean())
+        stp = w.step("stp", SingleTestTool(input1=w.inp), when=w.run)
+
+        outs = stp.outputs()
+        self.assertTrue(outs["out"].outtype.optional)
+        self.assertFalse(stp.tool.outputs_map()["out"].outtype.optional)
+        self.assertIs(outs, stp.outputs())
+
+    def test_step_sees_outputs_added_to_subworkflow_later(self):
+        inner = WorkflowBuilder("inner")
+        inner.input("inp", String())
+        inner.output("o1", source=inner.inp)
+
+        w = WorkflowBuilder("test_step_sees_outputs_added_to_subworkflow_later")
+        w.input("inp", String())
+        w.step("sub", inner(inp=w.inp))
+        w.output("outa", source=w.sub.o1)
+
+        inner.output("o2", source=inner.inp)
+        self.assertIn("o2", w.step_nodes["sub"].outputs())
+        w.output("outb", source=w.sub.o2)
+
+    def test_step_sees_inputs_added_to_subworkflow_later(self):
+        inner = WorkflowBuilder("inner")
+        inner.input("inp", String())
+        inner.output("out", source=inner.inp)
+
+        w = WorkflowBuilder("test_step_sees_inputs_added_to_subworkflow_later")
+        w.input("inp", String())
+        stp = w.step("sub", inner(inp=w.inp))
+
+        inner.input("inp2", String(optional=True))
+        self.assertIn("inp2", stp.inputs())
+
+    def test_switch_reuses_step_output_condition_input(self):
+        w = WorkflowBuilder("test_switch_reuses_step_output_condition_input")
+        w.input("inp", String())
+        w.step("stp", SingleTestTool(input1=w.inp))
+        w.conditional(
+            "switch",
+            [
+                (w.stp.out.equals("x"), SingleTestTool(input1=w.inp)),
+                (w.stp.out.equals("y"), SingleTestTool(input1=w.inp)),
+                SingleTestTool(input1=w.inp),
+            ],
+        )
+
+        switch_inputs = w.step_nodes["switch"].tool.input_nodes
+        self.assertIn("cond_stp_out", switch_inputs)
+
+    def test_switch_condition_rebuilder(self):
+        w = WorkflowBuilder("test_switch_condition_rebuilder")
+        w.input("inp", String())
+        wrapper = WorkflowBuilder("wrapper")
+        connections = {}
+        rebuilder = SwitchConditionRebuilder(wrapper, connections)
+
+        cond = w.inp.equals("x")
+        rebuilt = rebuilder.rebuild(cond)
+        self.assertIsNot(cond, rebuilt)
+        self.assertIs(rebuilt, rebuilder.rebuild(cond))
+        self.assertIn("cond_inp", wrapper.input_nodes)
+        self.assertIn("cond_inp", connections)
+
+        static_cond = StringFormatter("{a}", a="x").equals("x")
+        self.assertIs(static_cond, rebuilder.rebuild(static_cond))
+
+        constant = StringFormatter("constant")
+        self.assertIs(constant, rebuilder.rebuild(constant))
+
+    def test_get_tools_reused_subworkflow(self):
+        inner = WorkflowBuilder("test_get_tools_inner")
+        inner.input("inp", String())
+        inner.step("stp", SingleTestTool(input1=inner.inp))
+        inner.step("arr", ArrayTestTool(inps=inner.inp))
+
+        w = WorkflowBuilder("test_get_tools_reused_subworkflow")
+        w.input("inp", String())
+        w.step("sub1", inner(inp=w.inp))
+        w.step("sub2", inner(inp=w.inp))
+
+        self.assertSetEqual(
+            {"TestStepTool", "ArrayStepTool"}, set(w.get_tools().keys())
+        )
+
 
 class TestWorkflowInputCollection(TestCase):
     @classmethod
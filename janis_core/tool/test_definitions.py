@@ -1,5 +1,6 @@
 import os
-from typing import Dict, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Union, List
 
 from janis_core import CommandTool, CodeTool
 from janis_core import ToolType, Tool, Workflow
@@ -32,6 +33,49 @@ class ToolEvaluator:
             return cls.evaluate_code_tool(tool)
         raise Exception("Unrecognised tool type: " + str(tool.type()))
 
+    @classmethod
+    def evaluate_many(cls, tools: List[Tool]) -> Dict[str, Union[str, bool]]:
+        """
+        Evaluate many Janis tools, looking up the digests of all of their containers at once
+        rather than tool by tool
+
+        :param tools: Janis tools
+        :type tools: List[Tool]
+
+        :return: error message, True if valid or STATUS_SKIPPED, keyed by versioned tool id
+        :rtype: Dict[str, Union[str, bool]]
+        """
+        results = {}
+        to_evaluate = []
+        for tool in tools:
+            if tool.skip_test():
+                results[tool.versioned_id()] = cls.STATUS_SKIPPED
+            else:
+                to_evaluate.append(tool)
+
+        # only shared within this run, so an edited tool is translated again next time
+        translation_evaluations = {}
+        containers = [cls._get_containers(t) for t in to_evaluate]
+        # tools often share containers, so each one is only looked up once
+        digests = cls._get_container_digests(
+            list(dict.fromkeys(c for cs in containers for c in cs))
+        )
+
+        # one column per evaluated category, each row is a tool in to_evaluate
+        columns = [
+            [cls.evaluate_friendly_name(t) for t in to_evaluate],
+            [cls.evaluate_tool_module(t) for t in to_evaluate],
+            [cls.evaluate_metadata(t) for t in to_evaluate],
+            [cls._evaluate_container_digests(cs, digests) for cs in containers],
+            [cls.evaluate_translation(t, translation_evaluations) for t in to_evaluate],
+        ]
+
+        for i, tool in enumerate(to_evaluate):
+            errors = [column[i] for column in columns if column[i] is not True]
+            results[tool.versioned_id()] = "; ".join(errors) if errors else True
+
+        return results
+
     @classmethod
     def evaluate_command_tool(cls, tool: CommandTool) -> Union[str, bool]:
         """
@@ -87,13 +131,19 @@ class ToolEvaluator:
         """
         evaluation = {}
 
-        evaluation["friendly_name"] = cls.evaluate_friendly_name(tool)
-        evaluation["tool_module"] = cls.evaluate_tool_module(tool)
-        evaluation["metadata"] = cls.evaluate_metadata(tool)
-        # TODO: turn this on when we have implemented all unit tests
-        # evaluation["unit_tests_exists"] = cls.evaluate_unit_test_exists(tool)
-        evaluation["container"] = cls.evaluate_container(tool)
-        evaluation["translation"] = cls.evaluate_translation(tool)
+        # the container (registry lookups) and translation (disk + validators) checks
+        # are I/O bound and independent, so overlap them with the rest of the checks
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            container = executor.submit(cls.evaluate_container, tool)
+            translation = executor.submit(cls.evaluate_translation, tool)
+
+            evaluation["friendly_name"] = cls.evaluate_friendly_name(tool)
+            evaluation["tool_module"] = cls.evaluate_tool_module(tool)
+            evaluation["metadata"] = cls.evaluate_metadata(tool)
+            # TODO: turn this on when we have implemented all unit tests
+            # evaluation["unit_tests_exists"] = cls.evaluate_unit_test_exists(tool)
+            evaluation["container"] = container.result()
+            evaluation["translation"] = translation.result()
 
         return evaluation
 
@@ -185,8 +235,8 @@ class ToolEvaluator:
 
         return True
 
-    @staticmethod
-    def evaluate_container(tool: Tool) -> Union[str, bool]:
+    @classmethod
+    def evaluate_container(cls, tool: Tool) -> Union[str, bool]:
         """
         Evaluate if the container specified for this tool exists in the remote registry
 
@@ -196,23 +246,38 @@ class ToolEvaluator:
         :return:  error message or True if listed container for this tool exists in the remote registry
         :rtype: Union[str, bool]
         """
+        containers = cls._get_containers(tool)
+
         # If there is no container, we don't need to check if the container exists in the registry
-        if not tool.containers():
+        if not containers:
             return True
 
+        return cls._evaluate_container_digests(
+            containers, cls._get_container_digests(containers)
+        )
+
+    @staticmethod
+    def _get_containers(tool: Tool) -> List[str]:
         # Some tool might not have container, we only want to check if a container is listed, its digest exists
-        containers = [v for k, v in tool.containers().items()]
-        containers = list(filter(None, containers))
+        return list(filter(None, (tool.containers() or {}).values()))
 
+    @staticmethod
+    def _get_container_digests(containers: List[str]) -> Dict[str, str]:
         if not containers:
-            return True
+            return {}
 
         test_helpers.verify_janis_assistant_installed()
         from janis_assistant.data.container import get_digests_from_containers
 
         cache_location = os.path.join(os.getcwd(), "tests_output", "containers")
-        digests = get_digests_from_containers(containers, cache_location=cache_location)
+        return get_digests_from_containers(
+            list(dict.fromkeys(containers)), cache_location=cache_location
+        )
 
+    @staticmethod
+    def _evaluate_container_digests(
+        containers: List[str], digests: Dict[str, str]
+    ) -> Union[str, bool]:
         errors = []
         for c in containers:
             # if digest is exactly the same, it means digest is not found (it's just the tag name)
@@ -226,18 +291,34 @@ class ToolEvaluator:
 
         return True
 
-    @staticmethod
-    def evaluate_translation(tool: Tool) -> Union[str, bool]:
+    @classmethod
+    def evaluate_translation(
+        cls, tool: Tool, translation_evaluations: Dict[int, Union[str, bool]] = None
+    ) -> Union[str, bool]:
         """
         Evaluate if we can successfully translate to wdl and cwl
         # TODO: validate translations (will look into better way to ensure validation tool exists)
 
         :param tool: Janis tool
         :type tool: Tool
+        :param translation_evaluations: outcomes already evaluated in this run, keyed by
+            id(tool), so the same tool object is only translated once
+        :type translation_evaluations: Dict[int, Union[str, bool]]
 
         :return:  error message or True if we can successfully translate to wdl and cwl
         :rtype: Union[str, bool]
         """
+        if translation_evaluations is None:
+            return cls._evaluate_translation(tool)
+
+        key = id(tool)
+        if key not in translation_evaluations:
+            translation_evaluations[key] = cls._evaluate_translation(tool)
+
+        return translation_evaluations[key]
+
+    @staticmethod
+    def _evaluate_translation(tool: Tool) -> Union[str, bool]:
         engines = test_helpers.get_available_engines()
         output_dir = os.path.join(os.getcwd(), "tests_output", tool.id())
 
@@ -268,10 +349,7 @@ class ToolEvaluator:
             - A string of error messages if at least one of the evaluation fails
         :rtype: Union[str, bool]
         """
-        errors = []
-        for field in evaluation:
-            if evaluation[field] is not True:
-                errors.append(evaluation[field])
+        errors = [v for v in evaluation.values() if v is not True]
 
         if not errors:
             return True
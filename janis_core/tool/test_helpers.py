@@ -1,4 +1,6 @@
+import functools
 import hashlib
+import importlib.util
 from typing import Dict, Union, List, Set, Optional
 from datetime import datetime
 from tabulate import tabulate
@@ -7,34 +9,51 @@ from nose.tools import nottest
 
 import janis_core as jc
 from janis_core.translations.translationbase import TranslatorBase
+from janis_core.utils.errors import MissingDependencyException
 
 janis_assistant_version_required_min = "0.11.0"
 
 
-def verify_janis_assistant_installed():
+@functools.lru_cache(maxsize=1)
+def _probe_janis_assistant() -> Optional[str]:
     """
-    Check if the correct version of janis assistant is installed
+    Probe (once) whether a recent enough janis assistant is installed
+
+    :return: the reason janis assistant can't be used, or None if it can
     """
     min_version_required = janis_assistant_version_required_min
 
-    try:
-        import janis_assistant
+    if importlib.util.find_spec("janis_assistant") is None:
+        return (
+            f"to run this test, janis_asisstant >= {min_version_required}"
+            f" must be installed"
+        )
+
+    import janis_assistant
+
+    if parse_version(janis_assistant.__version__) < parse_version(min_version_required):
+        return (
+            f"to run this test, janis_asisstant >= {min_version_required}"
+            f" must be installed. Installed version is {janis_assistant.__version__}"
+        )
+
+    return None
 
-        if parse_version(janis_assistant.__version__) < parse_version(
-            min_version_required
-        ):
-            raise Exception(
-                f"to run this test, janis_asisstant >= {min_version_required}"
-                f" must be installed. Installed version is {janis_assistant.__version__}"
-            )
 
-    except Exception as e:
-        raise e
+def verify_janis_assistant_installed():
+    """
+    Check if the correct version of janis assistant is installed
+    """
+    problem = _probe_janis_assistant()
+    if problem is not None:
+        raise MissingDependencyException(problem)
 
 
+@functools.lru_cache(maxsize=1)
 def get_available_engines() -> Dict[str, TranslatorBase]:
     """
-    Get a list of available engines to run the test suite against
+    Get a list of available engines to run the test suite against,
+    this is cached so treat the returned dictionary as read-only
     """
     verify_janis_assistant_installed()
     from janis_assistant.engines.enginetypes import EngineType
@@ -19,12 +19,21 @@ This file is logically structured similar to the WDL equiv:
 
 ## IMPORTS
 
-import re, json
+import os, re, sys, json, hashlib, functools
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from io import StringIO
 from typing import List, Dict, Optional, Tuple
 from typing import Union
 
 import ruamel.yaml
+from ruamel.yaml.dumper import SafeDumper
+
+try:
+    # libyaml-backed emitter, only available when ruamel.yaml.clib is installed
+    from ruamel.yaml.cyaml import CSafeDumper as InputsDumper
+except ImportError:
+    InputsDumper = SafeDumper
 
 from janis_core.deps import cwlgen
 
@@ -67,43 +76,119 @@ from janis_core.types.common_data_types import (
 )
 from janis_core.utils.logger import Logger
 from janis_core.utils.metadata import ToolMetadata
+from janis_core.utils.scatter import ScatterMethod
 from janis_core.workflow.workflow import StepNode, InputNode, OutputNode
 
 CWL_VERSION = "v1.2"
 SHEBANG = "#!/usr/bin/env cwl-runner"
-yaml = ruamel.yaml.YAML()
+NON_ALPHANUMERIC_PATTERN = re.compile("[^0-9a-zA-Z]+")
+# characters json.dumps escapes (with the default ensure_ascii=True)
+JSON_ESCAPED_CHARACTERS_PATTERN = re.compile(r'[\\"]|[^ -~]')
+
+# (input id, cwl type) of the per-tool resource overrides
+RESOURCE_OVERRIDE_INPUTS = (
+    ("runtime_memory", "float?"),
+    ("runtime_cpu", "int?"),
+    ("runtime_disks", "int?"),
+    ("runtime_seconds", "int?"),
+)
+
+# the scatter methods are fixed, so their cwl names are resolved once
+SCATTER_METHOD_CWL = {m: m.cwl() for m in ScatterMethod}
 
 STDOUT_NAME = "_stdout"
 STDERR_NAME = "_stderr"
 
 
+@lru_cache(maxsize=None)
+def get_yaml() -> ruamel.yaml.YAML:
+    # built on first stringify rather than when janis_core (eagerly) imports this module
+    return ruamel.yaml.YAML()
+
+
+@lru_cache(maxsize=None)
+def get_loading_options() -> cwlgen.LoadingOptions:
+    # a cwlgen object given no LoadingOptions builds its own (including a http
+    # session), so the generated resource override inputs and marker requirements
+    # share this one, built on first use rather than at import
+    return cwlgen.LoadingOptions()
+
+
+@lru_cache(maxsize=None)
+def get_marker_requirement(requirement_type):
+    # field-less marker requirements (eg: cwlgen.ShellCommandRequirement) are never
+    # mutated, so one of each is built on first use and shared between documents
+    return requirement_type(loadingOptions=get_loading_options())
+
+
 ## TRANSLATION
 
 
 class CwlTranslator(TranslatorBase, metaclass=TranslatorMeta):
+    # Optional directory to keep cwl_format results in across runs, keyed by the
+    # sha256 of the unformatted document (so entries can never be stale).
+    format_cache_dir: Optional[str] = None
+
     def __init__(self):
         super().__init__(name="cwl")
 
     @staticmethod
     def stringify_commentedmap(m):
         io = StringIO()
-        yaml.dump(m, io)
+        get_yaml().dump(m, io)
         return io.getvalue()
 
+    @staticmethod
+    def dump_translated_workflow(wf: cwlgen.Savable, fp, as_json=False):
+        """
+        Write the (unformatted) workflow or tool to the file-like 'fp',
+        without holding the whole serialised document in memory.
+        """
+        saved = wf.save()
+
+        if as_json:
+            json.dump(saved, fp)
+            return
+
+        fp.write(SHEBANG + "\n")
+        get_yaml().dump(saved, fp)
+
     @staticmethod
     def stringify_translated_workflow(
         wf: cwlgen.Savable, should_format=True, as_json=False
     ):
-        saved = wf.save()
+        io = StringIO()
+        CwlTranslator.dump_translated_workflow(wf, io, as_json=as_json)
+        formatted = io.getvalue()
 
-        if as_json:
-            return json.dumps(saved)
+        if should_format and not as_json:
+            formatted = CwlTranslator.format_cwl(formatted)
 
-        formatted = SHEBANG + "\n" + CwlTranslator.stringify_commentedmap(saved)
-        if should_format:
-            from cwlformat.formatter import cwl_format
+        return formatted
 
-            formatted = cwl_format(formatted)
+    @classmethod
+    def format_cwl(cls, unformatted: str) -> str:
+        from cwlformat.formatter import cwl_format
+
+        if not cls.format_cache_dir:
+            return cwl_format(unformatted)
+
+        key = hashlib.sha256(unformatted.encode()).hexdigest()
+        cache_path = os.path.join(cls.format_cache_dir, key + ".cwl")
+        if os.path.exists(cache_path):
+            with open(cache_path) as f:
+                return f.read()
+
+        formatted = cwl_format(unformatted)
+        try:
+            os.makedirs(cls.format_cache_dir, exist_ok=True)
+            # write then rename so concurrent exports never read a partial file
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w+") as f:
+                f.write(formatted)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            Logger.warn(f"Couldn't write to the CWL format cache '{cache_path}': {e}")
 
         return formatted
 
@@ -111,22 +196,13 @@ class CwlTranslator(TranslatorBase, metaclass=TranslatorMeta):
     def stringify_translated_tool(
         tool: cwlgen.Savable, should_format=True, as_json=False
     ):
-        saved = tool.save()
-
-        if as_json:
-            return json.dumps(saved)
-
-        formatted = SHEBANG + "\n" + CwlTranslator.stringify_commentedmap(saved)
-        if should_format:
-            from cwlformat.formatter import cwl_format
-
-            formatted = cwl_format(formatted)
-
-        return formatted
+        return CwlTranslator.stringify_translated_workflow(
+            tool, should_format=should_format, as_json=as_json
+        )
 
     @staticmethod
     def stringify_translated_inputs(inputs):
-        return ruamel.yaml.dump(inputs, default_flow_style=False)
+        return ruamel.yaml.dump(inputs, Dumper=InputsDumper, default_flow_style=False)
 
     @staticmethod
     def validate_command_for(wfpath, inppath, tools_dir_path, tools_zip_path):
@@ -143,7 +219,16 @@ class CwlTranslator(TranslatorBase, metaclass=TranslatorMeta):
         is_packed=False,
         allow_empty_container=False,
         container_override=None,
+        translation_cache: Dict[str, Tuple] = None,
+        parallel=False,
+        resource_override_layouts: Dict[int, Tuple] = None,
     ) -> Tuple[cwlgen.Workflow, Dict[str, any]]:
+        """
+        :param parallel: Translate the command / code tools of the whole workflow
+            (including subworkflows) in a process pool. Tools must be picklable.
+        :param resource_override_layouts: classified steps per (sub)workflow, shared
+            across the recursive translation so each workflow is only inspected once.
+        """
 
         metadata = wf.metadata
         w = cwlgen.Workflow(
@@ -164,87 +249,137 @@ class CwlTranslator(TranslatorBase, metaclass=TranslatorMeta):
             for i in wf.input_nodes.values()
         ]
 
+        if resource_override_layouts is None:
+            resource_override_layouts = {}
         resource_inputs = []
         if with_resource_overrides:
-            resource_inputs = build_resource_override_maps_for_workflow(wf)
+            resource_inputs = build_resource_override_maps_for_workflow(
+                wf, layouts=resource_override_layouts
+            )
             w.inputs.extend(resource_inputs)
 
-        w.steps = []
-
-        for s in wf.step_nodes.values():
-            resource_overrides = {}
-            for r in resource_inputs:
-                if not r.id.startswith(s.id()):
-                    continue
-
-                resource_overrides[r.id[(len(s.id()) + 1) :]] = r.id
-
-            w.steps.extend(
-                translate_step_node(
-                    s,
-                    inputs_dict=toolinputs_dict,
-                    is_nested_tool=is_nested_tool,
-                    resource_overrides=resource_overrides,
-                    allow_empty_container=allow_empty_container,
-                )
+        overrides_by_step = group_resource_overrides_by_step(
+            resource_inputs, wf.step_nodes.keys()
+        )
+        w.steps = [
+            translated_step
+            for s in wf.step_nodes.values()
+            for translated_step in translate_step_node(
+                s,
+                inputs_dict=toolinputs_dict,
+                is_nested_tool=is_nested_tool,
+                resource_overrides=overrides_by_step.get(s.id(), {}),
+                allow_empty_container=allow_empty_container,
             )
+        ]
 
-        w.outputs = []
-        for o in wf.output_nodes.values():
-            new_output, additional_step = translate_workflow_output(o, tool=wf)
-            w.outputs.append(new_output)
-            if additional_step:
-                w.steps.append(additional_step)
+        translated_outputs = [
+            translate_workflow_output(o, tool=wf) for o in wf.output_nodes.values()
+        ]
+        w.outputs = [new_output for new_output, _ in translated_outputs]
+        w.steps.extend(
+            additional_step
+            for _, additional_step in translated_outputs
+            if additional_step
+        )
 
-        w.requirements.append(cwlgen.InlineJavascriptRequirement())
-        w.requirements.append(cwlgen.StepInputExpressionRequirement())
+        w.requirements = build_workflow_requirements(wf)
 
-        if wf.has_scatter:
-            w.requirements.append(cwlgen.ScatterFeatureRequirement())
-        if wf.has_subworkflow:
-            w.requirements.append(cwlgen.SubworkflowFeatureRequirement())
-        if wf.has_multiple_inputs:
-            w.requirements.append(cwlgen.MultipleInputFeatureRequirement())
+        # Subworkflows often share leaf tools, so translations are shared across the
+        # whole (recursive) translation, keyed by versioned_id like the tools dict.
+        if translation_cache is None:
+            translation_cache = {}
+        if parallel:
+            translation_cache.update(
+                cls.translate_leaf_tools_in_parallel(
+                    collect_leaf_tools(wf).values(),
+                    with_container=with_container,
+                    with_resource_overrides=with_resource_overrides,
+                    allow_empty_container=allow_empty_container,
+                    container_override=container_override,
+                )
+            )
 
         tools = {}
         tools_to_build: Dict[str, Tool] = {
             s.tool.id(): s.tool for s in wf.step_nodes.values()
         }
-        for t in tools_to_build:
-            tool: Tool = tools_to_build[t]
-            if tool.type() == ToolType.Workflow:
-                wf_cwl, subtools = cls.translate_workflow(
+        for tool in tools_to_build.values():
+            versioned_id = tool.versioned_id()
+            cached = translation_cache.get(versioned_id)
+            if cached is not None:
+                tool_cwl, subtools = cached
+            elif tool.type() == ToolType.Workflow:
+                tool_cwl, subtools = cls.translate_workflow(
                     tool,
                     is_nested_tool=True,
                     with_container=with_container,
                     with_resource_overrides=with_resource_overrides,
                     allow_empty_container=allow_empty_container,
                     container_override=container_override,
+                    translation_cache=translation_cache,
+                    resource_override_layouts=resource_override_layouts,
                 )
-                tools[tool.versioned_id()] = wf_cwl
-                tools.update(subtools)
             elif isinstance(tool, CommandTool):
-                tool_cwl = cls.translate_tool_internal(
-                    tool,
-                    with_container=with_container,
-                    with_resource_overrides=with_resource_overrides,
-                    allow_empty_container=allow_empty_container,
-                    container_override=container_override,
+                tool_cwl, subtools = (
+                    cls.translate_tool_internal(
+                        tool,
+                        with_container=with_container,
+                        with_resource_overrides=with_resource_overrides,
+                        allow_empty_container=allow_empty_container,
+                        container_override=container_override,
+                    ),
+                    None,
                 )
-                tools[tool.versioned_id()] = tool_cwl
             elif isinstance(tool, CodeTool):
-                tool_cwl = cls.translate_code_tool_internal(
-                    tool,
-                    with_docker=with_container,
-                    allow_empty_container=allow_empty_container,
-                    container_override=container_override,
+                tool_cwl, subtools = (
+                    cls.translate_code_tool_internal(
+                        tool,
+                        with_docker=with_container,
+                        allow_empty_container=allow_empty_container,
+                        container_override=container_override,
+                    ),
+                    None,
                 )
-                tools[tool.versioned_id()] = tool_cwl
             else:
                 raise Exception(f"Unknown tool type: '{type(tool)}'")
 
+            translation_cache[versioned_id] = (tool_cwl, subtools)
+            tools[versioned_id] = tool_cwl
+            if subtools:
+                tools.update(subtools)
+
         return w, tools
 
+    @classmethod
+    def translate_leaf_tools_in_parallel(
+        cls,
+        tools,
+        with_container=True,
+        with_resource_overrides=False,
+        allow_empty_container=False,
+        container_override=None,
+    ) -> Dict[str, Tuple]:
+        """
+        Translate command / code tools in separate processes, returning the
+        same {versioned_id: (tool_cwl, None)} entries as the translation cache.
+        """
+        tools = list(tools)
+        if not tools:
+            return {}
+
+        translate = functools.partial(
+            translate_leaf_tool,
+            with_container=with_container,
+            with_resource_overrides=with_resource_overrides,
+            allow_empty_container=allow_empty_container,
+            container_override=container_override,
+        )
+        with ProcessPoolExecutor() as executor:
+            translated = list(executor.map(translate, tools))
+
+        return {t.versioned_id(): (t_cwl, None) for t, t_cwl in zip(tools, translated)}
+
     @classmethod
     def convert_operator_to_commandtool(
         cls,
@@ -260,7 +395,7 @@ class CwlTranslator(TranslatorBase, metaclass=TranslatorMeta):
                 "Expected at least one operator when building intermediary expression tool"
             )
 
-        prepare_alias = lambda x: f"_{re.sub('[^0-9a-zA-Z]+', '', x)}"
+        prepare_alias = lambda x: f"_{NON_ALPHANUMERIC_PATTERN.sub('', x)}"
 
         # two step process
         #   1. Look through and find ALL sources includng an operator's leaves
@@ -432,44 +567,34 @@ class CwlTranslator(TranslatorBase, metaclass=TranslatorMeta):
             resource_inputs = build_resource_override_maps_for_workflow(wf)
             w.inputs.extend(resource_inputs)
 
-        w.steps = []
-
-        for s in wf.step_nodes.values():
-            resource_overrides = {}
-            for r in resource_inputs:
-                if not r.id.startswith(s.id()):
-                    continue
-
-                resource_overrides[r.id[(len(s.id()) + 1) :]] = r.id
-
-            w.steps.extend(
-                translate_step_node(
-                    s,
-                    inputs_dict=toolinputs_dict,
-                    is_nested_tool=is_nested_tool,
-                    resource_overrides=resource_overrides,
-                    use_run_ref=False,
-                    allow_empty_container=allow_empty_container,
-                    container_override=container_override,
-                )
+        overrides_by_step = group_resource_overrides_by_step(
+            resource_inputs, wf.step_nodes.keys()
+        )
+        w.steps = [
+            translated_step
+            for s in wf.step_nodes.values()
+            for translated_step in translate_step_node(
+                s,
+                inputs_dict=toolinputs_dict,
+                is_nested_tool=is_nested_tool,
+                resource_overrides=overrides_by_step.get(s.id(), {}),
+                use_run_ref=False,
+                allow_empty_container=allow_empty_container,
+                container_override=container_override,
             )
+        ]
 
-        w.outputs = []
-        for o in wf.output_nodes.values():
-            new_output, additional_step = translate_workflow_output(o, tool=wf)
-            w.outputs.append(new_output)
-            if additional_step:
-                w.steps.append(additional_step)
-
-        w.requirements.append(cwlgen.InlineJavascriptRequirement())
-        w.requirements.append(cwlgen.StepInputExpressionRequirement())
+        translated_outputs = [
+            translate_workflow_output(o, tool=wf) for o in wf.output_nodes.values()
+        ]
+        w.outputs = [new_output for new_output, _ in translated_outputs]
+        w.steps.extend(
+            additional_step
+            for _, additional_step in translated_outputs
+            if additional_step
+        )
 
-        if wf.has_scatter:
-            w.requirements.append(cwlgen.ScatterFeatureRequirement())
-        if wf.has_subworkflow:
-            w.requirements.append(cwlgen.SubworkflowFeatureRequirement())
-        if wf.has_multiple_inputs:
-            w.requirements.append(cwlgen.MultipleInputFeatureRequirement())
+        w.requirements = build_workflow_requirements(wf)
 
         return w
 
@@ -484,14 +609,15 @@ class CwlTranslator(TranslatorBase, metaclass=TranslatorMeta):
         container_override=None,
     ):
         metadata = tool.metadata if tool.metadata else ToolMetadata()
+        tool_id = tool.id()
 
         stdout = STDOUT_NAME
         stderr = STDERR_NAME
 
         tool_cwl = cwlgen.CommandLineTool(
-            id=tool.id(),
+            id=tool_id,
             baseCommand=tool.base_command(),
-            label=tool.friendly_name() or tool.id(),
+            label=tool.friendly_name() or tool_id,
             doc=metadata.documentation,
             cwlVersion=CWL_VERSION,
             stdin=None,
@@ -500,16 +626,17 @@ class CwlTranslator(TranslatorBase, metaclass=TranslatorMeta):
             inputs=[],
             outputs=[],
             arguments=[],
-            requirements=[],
+            # if any(not i.shell_quote for i in tool.inputs()):
+            requirements=[
+                get_marker_requirement(cwlgen.ShellCommandRequirement),
+                get_marker_requirement(cwlgen.InlineJavascriptRequirement),
+            ],
             hints=[],
         )
 
-        inputsdict = {t.id(): t for t in tool.inputs()}
-
-        # if any(not i.shell_quote for i in tool.inputs()):
-        tool_cwl.requirements.append(cwlgen.ShellCommandRequirement())
+        tool_inputs = tool.inputs()
+        inputsdict = {t.id(): t for t in tool_inputs}
 
-        tool_cwl.requirements.extend([cwlgen.InlineJavascriptRequirement()])
         ops = [InputSelector("runtime_seconds")]
         tooltime = tool.time({})
         if tooltime is not None:
@@ -520,7 +647,7 @@ class CwlTranslator(TranslatorBase, metaclass=TranslatorMeta):
                 timelimit=CwlTranslator.unwrap_expression(
                     FirstOperator(ops),
                     code_environment=False,
-                    tool_id=tool.id(),
+                    tool_id=tool_id,
                     inputs_dict=inputsdict,
                 )
             )
@@ -534,7 +661,7 @@ class CwlTranslator(TranslatorBase, metaclass=TranslatorMeta):
                     CwlTranslator.unwrap_expression(
                         value=v,
                         code_environment=False,
-                        toolid=tool.id(),
+                        toolid=tool_id,
                         inputs_dict=inputsdict,
                     ),
                 )
@@ -544,13 +671,13 @@ class CwlTranslator(TranslatorBase, metaclass=TranslatorMeta):
 
         inputs_that_require_localisation = [
             ti
-            for ti in tool.inputs()
+            for ti in tool_inputs
             if ti.localise_file
             and (
                 isinstance(ti.input_type.received_type(), File)
                 or (
-                    issubclass(type(ti.input_type), Array)
-                    and issubclass(type(ti.input_type.subtype()), File)
+                    isinstance(ti.input_type, Array)
+                    and isinstance(ti.input_type.subtype(), File)
                 )
             )
         ]
@@ -578,18 +705,18 @@ class CwlTranslator(TranslatorBase, metaclass=TranslatorMeta):
                 )
             elif not allow_empty_container:
                 raise Exception(
-                    f"The tool '{tool.id()}' did not have a container and no container override was specified. "
+                    f"The tool '{tool_id}' did not have a container and no container override was specified. "
                     f"Although not recommended, Janis can export empty docker containers with the parameter "
                     f"'allow_empty_container=True' or --allow-empty-container"
                 )
 
-        tool_cwl.inputs.extend(
-            translate_tool_input(i, inputsdict, tool) for i in tool.inputs()
-        )
-        tool_cwl.outputs.extend(
-            translate_tool_output(o, inputsdict=inputsdict, tool=tool, toolid=tool.id())
+        tool_cwl.inputs = [
+            translate_tool_input(i, inputsdict, tool) for i in tool_inputs
+        ]
+        tool_cwl.outputs = [
+            translate_tool_output(o, inputsdict=inputsdict, tool=tool, toolid=tool_id)
             for o in tool.outputs()
-        )
+        ]
 
         initial_workdir_req = cls.build_initial_workdir_from_tool(tool)
         if initial_workdir_req:
@@ -597,20 +724,18 @@ class CwlTranslator(TranslatorBase, metaclass=TranslatorMeta):
 
         args = tool.arguments()
         if args:
-            tool_cwl.arguments.extend(
-                translate_tool_argument(a, tool, inputs_dict=inputsdict)
-                for a in tool.arguments()
-            )
+            tool_cwl.arguments = [
+                translate_tool_argument(a, tool, inputs_dict=inputsdict) for a in args
+            ]
 
         if with_resource_overrides:
             # work out whether (the tool of) s is a workflow or tool
+            loading_options = get_loading_options()
             tool_cwl.inputs.extend(
-                [
-                    cwlgen.CommandInputParameter(id="runtime_memory", type="float?"),
-                    cwlgen.CommandInputParameter(id="runtime_cpu", type="int?"),
-                    cwlgen.CommandInputParameter(id="runtime_disks", type="int?"),
-                    cwlgen.CommandInputParameter(id="runtime_seconds", type="int?"),
-                ]
+                cwlgen.CommandInputParameter(
+                    id=name, type=cwl_type, loadingOptions=loading_options
+                )
+                for name, cwl_type in RESOURCE_OVERRIDE_INPUTS
             )
 
             tool_cwl.requirements.append(
@@ -650,32 +775,18 @@ class CwlTranslator(TranslatorBase, metaclass=TranslatorMeta):
         allow_empty_container=False,
         container_override=None,
     ):
-
-        stdouts = [
-            o.outtype
-            for o in tool.tool_outputs()
-            if isinstance(o.outtype, Stdout) and o.outtype.stdoutname
-        ]
-        stderrs = [
-            o.outtype
-            for o in tool.tool_outputs()
-            if isinstance(o.outtype, Stderr) and o.outtype.stderrname
-        ]
         stdout = "cwl.output.json"
         stderr = "python-capture.stderr"
 
+        tool_id = tool.id()
         scriptname = tool.script_name()
-        inputsdict = {t.id(): t for t in tool.inputs()}
-
-        if isinstance(stderr, InputSelector):
-            stderr = translate_input_selector(
-                stderr, code_environment=False, inputs_dict=inputsdict
-            )
+        tool_inputs = tool.inputs()
+        inputsdict = {t.id(): t for t in tool_inputs}
 
         tool_cwl = cwlgen.CommandLineTool(
-            id=tool.id(),
+            id=tool_id,
             baseCommand=tool.base_command(),
-            label=tool.id(),
+            label=tool_id,
             doc="",  # metadata.documentation,
             cwlVersion=CWL_VERSION,
             stderr=stderr,
@@ -685,7 +796,7 @@ class CwlTranslator(TranslatorBase, metaclass=TranslatorMeta):
             requirements=[],
         )
 
-        tool_cwl.inputs.extend(
+        tool_cwl.inputs = [
             translate_tool_input(
                 ToolInput(
                     t.id(),
@@ -697,33 +808,11 @@ class CwlTranslator(TranslatorBase, metaclass=TranslatorMeta):
                 inputsdict=inputsdict,
                 tool=tool,
             )
-            for t in tool.inputs()
-        )
-
-        for output in tool.tool_outputs():
-            if isinstance(output.outtype, (Stdout, Stderr)):
-                tool_cwl.outputs.append(
-                    cwlgen.CommandOutputParameter(
-                        id=output.tag, label=output.tag, type=output.outtype.cwl_type()
-                    )
-                )
-                continue
-            output_eval = CwlTranslator.prepare_output_eval_for_python_codetool(
-                output.id(), output.outtype
-            )
-            tool_cwl.outputs.append(
-                cwlgen.CommandOutputParameter(
-                    id=output.tag,
-                    label=output.tag,
-                    # param_format=None,
-                    # streamable=None,
-                    doc=output.doc.doc if output.doc else None,
-                    type=output.outtype.cwl_type(),
-                    outputBinding=None
-                    if not output_eval
-                    else cwlgen.CommandOutputBinding(outputEval=output_eval),
-                )
-            )
+            for t in tool_inputs
+        ]
+        tool_cwl.outputs = [
+            cls.translate_code_tool_output(output) for output in tool.tool_outputs()
+        ]
 
         tool_cwl.requirements.append(
             cwlgen.InitialWorkDirRequirement(
@@ -735,7 +824,9 @@ class CwlTranslator(TranslatorBase, metaclass=TranslatorMeta):
                 ]
             )
         )
-        tool_cwl.requirements.append(cwlgen.InlineJavascriptRequirement())
+        tool_cwl.requirements.append(
+            get_marker_requirement(cwlgen.InlineJavascriptRequirement)
+        )
 
         if with_docker:
             container = (
@@ -745,67 +836,42 @@ class CwlTranslator(TranslatorBase, metaclass=TranslatorMeta):
 
             if container is not None:
                 tool_cwl.requirements.append(
-                    cwlgen.DockerRequirement(dockerPull=tool.container())
+                    cwlgen.DockerRequirement(dockerPull=container)
                 )
             elif not allow_empty_container:
                 raise Exception(
-                    f"The tool '{tool.id()}' did not have a container. Although not recommended, "
+                    f"The tool '{tool_id}' did not have a container. Although not recommended, "
                     f"Janis can export empty docker containers with the parameter 'allow_empty_container=True "
                     f"or --allow-empty-container"
                 )
 
         return tool_cwl
 
-    @staticmethod
-    def prepare_output_eval_for_python_codetool(tag: str, outtype: DataType):
-        return None
-
-        requires_obj_capture = isinstance(outtype, (File, Directory))
-        arraylayers = None
-        if outtype.is_array() and isinstance(
-            outtype.fundamental_type(), (File, Directory)
-        ):
-            requires_obj_capture = True
-            base = outtype
-            arraylayers = 0
-            while base.is_array():
-                arraylayers += 1
-                base = outtype.subtype()
-
-        if not requires_obj_capture:
-            return None
+    @classmethod
+    def translate_code_tool_output(cls, output) -> cwlgen.CommandOutputParameter:
+        if isinstance(output.outtype, (Stdout, Stderr)):
+            return cwlgen.CommandOutputParameter(
+                id=output.tag, label=output.tag, type=output.outtype.cwl_type()
+            )
 
-        classtype = "File" if isinstance(base, File) else "Directory"
-        fileout_generator = (
-            lambda c: f"{{ class: '{classtype}', path: {c}, basename: {c}.substring({c}.lastIndexOf('/') + 1) }}"
+        output_eval = cls.prepare_output_eval_for_python_codetool(
+            output.id(), output.outtype
+        )
+        return cwlgen.CommandOutputParameter(
+            id=output.tag,
+            label=output.tag,
+            # param_format=None,
+            # streamable=None,
+            doc=output.doc.doc if output.doc else None,
+            type=output.outtype.cwl_type(),
+            outputBinding=None
+            if not output_eval
+            else cwlgen.CommandOutputBinding(outputEval=output_eval),
         )
 
-        if arraylayers:
-            els = []
-
-            base_var = f"v{arraylayers}"
-            center = f"els.push({fileout_generator(base_var)};"
-
-            def iteratively_wrap(center, iterable, layers_remaining):
-                var = f"v{layers_remaining}"
-                if layers_remaining > 1:
-                    center = iteratively_wrap(center, var, layers_remaining - 1)
-                return f"for (var {var} of {iterable}) {{ {center} }}"
-
-            out_capture = "\n".join(
-                [
-                    "var els = [];",
-                    iteratively_wrap(center, "c", arraylayers),
-                    "return els",
-                ]
-            )
-        else:
-            capture = fileout_generator("self")
-            out_capture = f"return {capture};"
-
-        return f"""${{
-{out_capture}
-}}"""
+    @staticmethod
+    def prepare_output_eval_for_python_codetool(tag: str, outtype: DataType):
+        return None
 
     @classmethod
     def wrap_in_codeblock_if_required(cls, value, is_code_environment):
@@ -856,6 +922,20 @@ class CwlTranslator(TranslatorBase, metaclass=TranslatorMeta):
                 return "null"
             return None
 
+        # exact type lookup for the most common leaves, subclasses use the chain below
+        handler = UNWRAP_HANDLERS_BY_TYPE.get(type(value))
+        if handler is not None:
+            return handler(
+                value,
+                code_environment=code_environment,
+                selector_override=selector_override,
+                tool=tool,
+                for_output=for_output,
+                inputs_dict=inputs_dict,
+                add_path_suffix_to_input_selector_if_required=add_path_suffix_to_input_selector_if_required,
+                **debugkwargs,
+            )
+
         if isinstance(value, StepNode):
             raise Exception(
                 f"The Step node '{value.id()}' was found when unwrapping an expression, "
@@ -880,13 +960,9 @@ class CwlTranslator(TranslatorBase, metaclass=TranslatorMeta):
             )
 
         if isinstance(value, str):
-            if not code_environment:
-                return value
-            return CwlTranslator.quote_values_if_code_environment(
-                prepare_escaped_string(value), code_environment
-            )
-        elif isinstance(value, int) or isinstance(value, float):
-            return str(value)
+            return unwrap_string(value, code_environment=code_environment)
+        elif isinstance(value, (int, float)):
+            return unwrap_number(value)
         elif isinstance(value, Filename):
             # value.generated_filenamecwl() if code_environment else f"$({value.generated_filenamecwl()})"
             return CwlTranslator.quote_values_if_code_environment(
@@ -906,7 +982,7 @@ class CwlTranslator(TranslatorBase, metaclass=TranslatorMeta):
             )
 
         elif isinstance(value, StringFormatter):
-            return translate_string_formatter(
+            return unwrap_string_formatter(
                 value,
                 selector_override=selector_override,
                 code_environment=code_environment,
@@ -951,17 +1027,13 @@ class CwlTranslator(TranslatorBase, metaclass=TranslatorMeta):
                 return "self[1]"
 
         elif isinstance(value, InputSelector):
-            if for_output:
-                el = prepare_filename_replacements_for(value, inputsdict=inputs_dict)
-                return cls.wrap_in_codeblock_if_required(
-                    el, is_code_environment=code_environment
-                )
-            return translate_input_selector(
-                selector=value,
+            return unwrap_input_selector(
+                value,
                 code_environment=code_environment,
                 selector_override=selector_override,
+                for_output=for_output,
                 inputs_dict=inputs_dict,
-                add_path_suffix_if_required=add_path_suffix_to_input_selector_if_required,
+                add_path_suffix_to_input_selector_if_required=add_path_suffix_to_input_selector_if_required,
             )
         elif isinstance(value, WildcardSelector):
             return "self"
@@ -1050,11 +1122,76 @@ class CwlTranslator(TranslatorBase, metaclass=TranslatorMeta):
         return workflow.id() + "-resources.yml"
 
 
+def unwrap_string(value: str, code_environment=True, **kwargs):
+    if not code_environment:
+        return value
+    return f'"{prepare_escaped_string(value)}"'
+
+
+def unwrap_number(value, **kwargs):
+    return str(value)
+
+
+def unwrap_string_formatter(
+    value: StringFormatter,
+    code_environment=True,
+    selector_override=None,
+    tool=None,
+    inputs_dict=None,
+    for_output=False,
+    add_path_suffix_to_input_selector_if_required=True,
+    **debugkwargs,
+):
+    return translate_string_formatter(
+        value,
+        selector_override=selector_override,
+        code_environment=code_environment,
+        tool=tool,
+        inputs_dict=inputs_dict,
+        **debugkwargs,
+    )
+
+
+def unwrap_input_selector(
+    value: InputSelector,
+    code_environment=True,
+    selector_override=None,
+    for_output=False,
+    inputs_dict=None,
+    add_path_suffix_to_input_selector_if_required=True,
+    **kwargs,
+):
+    if for_output:
+        el = prepare_filename_replacements_for(value, inputsdict=inputs_dict)
+        return CwlTranslator.wrap_in_codeblock_if_required(
+            el, is_code_environment=code_environment
+        )
+    return translate_input_selector(
+        selector=value,
+        code_environment=code_environment,
+        selector_override=selector_override,
+        inputs_dict=inputs_dict,
+        add_path_suffix_if_required=add_path_suffix_to_input_selector_if_required,
+    )
+
+
+UNWRAP_HANDLERS_BY_TYPE = {
+    str: unwrap_string,
+    int: unwrap_number,
+    float: unwrap_number,
+    StringFormatter: unwrap_string_formatter,
+    InputSelector: unwrap_input_selector,
+}
+
+
 # matcher_double_quote = re.compile('[^\\\]"')
 # matcher_single_quote = re.compile("[^\\\]'")
 
 
 def prepare_escaped_string(value: str):
+    # most strings have nothing json would escape, so skip the encode + slice copy
+    if not JSON_ESCAPED_CHARACTERS_PATTERN.search(value):
+        return value
     return json.dumps(value)[1:-1]
 
 
@@ -1080,15 +1217,12 @@ def translate_workflow_input(inp: InputNode, inputsdict) -> cwlgen.InputParamete
         else:
             default = inp.default
 
-    sf = dt.secondary_files()
-
-    if dt.is_array():
-        sf = dt.subtype().secondary_files()
+    sf = dt.subtype().secondary_files() if dt.is_array() else dt.secondary_files()
 
     return cwlgen.WorkflowInputParameter(
         id=inp.id(),
         default=default,
-        secondaryFiles=[cwlgen.SecondaryFileSchema(s) for s in sf] if sf else None,
+        secondaryFiles=prepare_secondary_file_schemas(sf),
         format=None,
         streamable=None,
         doc=doc,
@@ -1130,15 +1264,13 @@ def translate_workflow_output(
     else:
         source = CwlTranslator.unwrap_selector_for_reference(node.source)
 
-    sf = None
-    if node.datatype.secondary_files():
-        sf = [cwlgen.SecondaryFileSchema(s) for s in node.datatype.secondary_files()]
-
     return (
         cwlgen.WorkflowOutputParameter(
             id=node.id(),
             outputSource=source,
-            secondaryFiles=sf,
+            secondaryFiles=prepare_secondary_file_schemas(
+                node.datatype.secondary_files()
+            ),
             streamable=None,
             doc=doc,
             type=ot.cwl_type(),
@@ -1187,7 +1319,7 @@ def translate_tool_input(
             inputs_dict=inputsdict,
         )
 
-    data_type = toolinput.input_type.cwl_type(default is not None)
+    data_type = intype.cwl_type(default is not None)
 
     bind_to_commandline = toolinput.position is not None or toolinput.prefix is not None
     input_binding = (
@@ -1205,7 +1337,7 @@ def translate_tool_input(
     )
 
     non_optional_dt_component = (
-        [t for t in data_type if t != "null"][0]
+        next(t for t in data_type if t != "null")
         if isinstance(data_type, list)
         else data_type
     )
@@ -1214,7 +1346,7 @@ def translate_tool_input(
     # https://www.commonwl.org/user_guide/09-array-inputs/
     if (
         bind_to_commandline
-        and toolinput.input_type.is_array()
+        and intype.is_array()
         and isinstance(non_optional_dt_component, cwlgen.CommandInputArraySchema)
     ):
         if toolinput.prefix_applies_to_all_elements:
@@ -1361,6 +1493,77 @@ $}}
     return None
 
 
+RESOLVE_SECONDARY_JS = """\
+        function resolveSecondary(base, secPattern) {
+          if (secPattern[0] == "^") {
+            var spl = base.split(".");
+            var endIndex = spl.length > 1 ? spl.length - 1 : 1;
+            return resolveSecondary(spl.slice(undefined, endIndex).join("."), secPattern.slice(1));
+          }
+          return base + secPattern
+        }"""
+
+RESOLVE_SECONDARY_ENTRY = """\
+                {{
+                    {field}: resolveSecondary(self.{field}, "{pattern}"),
+                    basename: resolveSecondary(self.basename, "{basename}"),
+                    class: "File",
+                }}"""
+
+
+def build_resolve_secondaries_expression(
+    field: str, secs: Dict[str, str], secondary_files: List[str], separator: str
+) -> str:
+    """
+    Build the CWL expression that renames secondary files using 'secs'.
+    Only the entries are formatted per call, the JS helper is a constant.
+
+    :param field: 'path' for outputs, 'location' for inputs
+    :param separator: whitespace between the helper and the return statement
+    """
+    # many tools share the same secondary types (eg: BamBai), so cache on the patterns
+    return _build_resolve_secondaries_expression(
+        field, tuple((secs.get(s, s), s) for s in secondary_files), separator
+    )
+
+
+@lru_cache(maxsize=None)
+def _build_resolve_secondaries_expression(
+    field: str, patterns: Tuple[Tuple[str, str], ...], separator: str
+) -> str:
+    formattedsecs = ",\n".join(
+        RESOLVE_SECONDARY_ENTRY.format(field=field, pattern=pattern, basename=s)
+        for pattern, s in patterns
+    )
+    return "".join(
+        (
+            "${\n\n",
+            RESOLVE_SECONDARY_JS,
+            separator,
+            "        return [\n",
+            formattedsecs,
+            "\n        ];\n\n}",
+        )
+    )
+
+
+def prepare_secondary_file_schemas(
+    secondary_files: Optional[List[str]],
+) -> Optional[List[cwlgen.SecondaryFileSchema]]:
+    if not secondary_files:
+        return None
+    return list(_build_secondary_file_schemas(tuple(secondary_files)))
+
+
+@lru_cache(maxsize=None)
+def _build_secondary_file_schemas(
+    secondary_files: Tuple[str, ...]
+) -> Tuple[cwlgen.SecondaryFileSchema, ...]:
+    # the schemas are only ever saved (like the marker requirements), so each
+    # combination of patterns is built once and shared between documents
+    return tuple(cwlgen.SecondaryFileSchema(s) for s in secondary_files)
+
+
 def prepare_tool_output_secondaries(
     output,
 ) -> Optional[Union[List[cwlgen.SecondaryFileSchema], str, List[str]]]:
@@ -1381,39 +1584,15 @@ def prepare_tool_output_secondaries(
     """
 
     if not output.secondaries_present_as:
-        sfs = output.output_type.secondary_files()
-        if sfs:
-            return [cwlgen.SecondaryFileSchema(s) for s in sfs]
-        return None
-
-    secs = output.secondaries_present_as
-    tb = "    "
-    formattedsecs = ",\n".join(
-        f"""\
-{4*tb}{{
-{5*tb}path: resolveSecondary(self.path, "{secs.get(s, s)}"),
-{5*tb}basename: resolveSecondary(self.basename, "{s}"),
-{5*tb}class: "File",
-{4*tb}}}"""
-        for s in output.output_type.secondary_files()
-    )
+        return prepare_secondary_file_schemas(output.output_type.secondary_files())
 
     return [
-        f"""${{
-
-        function resolveSecondary(base, secPattern) {{
-          if (secPattern[0] == "^") {{
-            var spl = base.split(".");
-            var endIndex = spl.length > 1 ? spl.length - 1 : 1;
-            return resolveSecondary(spl.slice(undefined, endIndex).join("."), secPattern.slice(1));
-          }}
-          return base + secPattern
-        }}
-        return [
-{formattedsecs}
-        ];
-
-}}"""
+        build_resolve_secondaries_expression(
+            "path",
+            output.secondaries_present_as,
+            output.output_type.secondary_files(),
+            separator="\n",
+        )
     ]
 
 
@@ -1436,40 +1615,15 @@ def prepare_tool_input_secondaries(
     :return:
     """
     if not inp.secondaries_present_as:
-        sfs = inp.input_type.secondary_files()
-        if sfs:
-            return [cwlgen.SecondaryFileSchema(s) for s in sfs]
-        return None
-
-    secs = inp.secondaries_present_as
-    tb = "    "
-    formattedsecs = ",\n".join(
-        f"""\
-{4*tb}{{
-{5*tb}location: resolveSecondary(self.location, "{secs.get(s, s)}"),
-{5*tb}basename: resolveSecondary(self.basename, "{s}"),
-{5*tb}class: "File",
-{4*tb}}}"""
-        for s in inp.input_type.secondary_files()
-    )
+        return prepare_secondary_file_schemas(inp.input_type.secondary_files())
 
     return [
-        f"""${{
-
-        function resolveSecondary(base, secPattern) {{
-          if (secPattern[0] == "^") {{
-            var spl = base.split(".");
-            var endIndex = spl.length > 1 ? spl.length - 1 : 1;
-            return resolveSecondary(spl.slice(undefined, endIndex).join("."), secPattern.slice(1));
-          }}
-          return base + secPattern
-        }}
-
-        return [
-{formattedsecs}
-        ];
-
-}}"""
+        build_resolve_secondaries_expression(
+            "location",
+            inp.secondaries_present_as,
+            inp.input_type.secondary_files(),
+            separator="\n\n",
+        )
     ]
 
 
@@ -1510,7 +1664,7 @@ def get_run_ref_from_subtool(
 
 
 def add_when_conditional_for_workflow_stp(stp: cwlgen.WorkflowStep, when: Selector):
-    prepare_alias = lambda x: f"__when_{re.sub('[^0-9a-zA-Z]+', '', x)}"
+    prepare_alias = lambda x: f"__when_{NON_ALPHANUMERIC_PATTERN.sub('', x)}"
 
     # two step process
     #   1. Look through and find ALL sources includng an operator's leaves
@@ -1573,6 +1727,7 @@ def translate_step_node(
 ) -> List[cwlgen.WorkflowStep]:
 
     tool = step.tool
+    step_id = step.id()
 
     # RUN REF
     run_ref = get_run_ref_from_subtool(
@@ -1587,7 +1742,7 @@ def translate_step_node(
     # CONSTRUCTION
 
     cwlstep = cwlgen.WorkflowStep(
-        id=step.id(),
+        id=step_id,
         run=run_ref,
         label=tool.friendly_name(),
         doc=step.doc.doc if step.doc else None,
@@ -1602,9 +1757,10 @@ def translate_step_node(
 
     scatter_fields = set()
     if step.scatter:
-        if len(step.scatter.fields) > 1:
-            cwlstep.scatterMethod = step.scatter.method.cwl()
-        cwlstep.scatter = step.scatter.fields
+        fields = step.scatter.fields
+        if len(fields) > 1:
+            cwlstep.scatterMethod = SCATTER_METHOD_CWL[step.scatter.method]
+        cwlstep.scatter = fields
         scatter_fields = set(cwlstep.scatter or [])
 
     elif step.foreach is not None:
@@ -1612,7 +1768,7 @@ def translate_step_node(
             step.foreach,
         )
         if isinstance(step.foreach, Operator):
-            additional_step_id = f"_evaluate_preforeach-{step.id()}"
+            additional_step_id = f"_evaluate_preforeach-{step_id}"
 
             tool = CwlTranslator.convert_operator_to_commandtool(
                 step_id=additional_step_id,
@@ -1646,7 +1802,7 @@ def translate_step_node(
                 continue
             else:
                 raise Exception(
-                    f"Error when building connections for cwlstep '{step.id()}', "
+                    f"Error when building connections for cwlstep '{step_id}', "
                     f"could not find required connection: '{k}'"
                 )
 
@@ -1707,7 +1863,7 @@ def translate_step_node(
 
         elif k in scatter_fields:
             # it's an operator, and the CWL valueFrom scatters are post-scatter (which IMO is silly)
-            additional_step_id = f"_evaluate_prescatter-{step.id()}-{k}"
+            additional_step_id = f"_evaluate_prescatter-{step_id}-{k}"
 
             tool = CwlTranslator.convert_operator_to_commandtool(
                 step_id=additional_step_id,
@@ -1721,7 +1877,7 @@ def translate_step_node(
 
         else:
             prepare_alias = (
-                lambda x: f"_{step.id()}_{k}_{re.sub('[^0-9a-zA-Z]+', '', x)}"
+                lambda x: f"_{step_id}_{k}_{NON_ALPHANUMERIC_PATTERN.sub('', x)}"
             )
 
             # two step process
@@ -1810,7 +1966,7 @@ def translate_step_node(
 
 
 def is_selector(selector):
-    return issubclass(type(selector), Selector)
+    return isinstance(selector, Selector)
 
 
 def translate_input_selector(
@@ -1831,8 +1987,9 @@ def translate_input_selector(
 
     if selector_override and sel in selector_override:
         sel = selector_override[sel]
+        wrapped = None
     else:
-        sel = f"inputs.{sel}"
+        sel, wrapped = input_reference(sel)
 
     if not skip_lookup:
 
@@ -1846,53 +2003,102 @@ def translate_input_selector(
             )
 
         tinp: ToolInput = inputs_dict[selector.input_to_select]
+        typed_sel, unsupported = reference_input_for_type(
+            sel,
+            tinp.input_type,
+            remove_file_extension=bool(selector.remove_file_extension),
+            localise_file=bool(tinp.localise_file),
+            add_path_suffix_if_required=bool(add_path_suffix_if_required),
+        )
+        if typed_sel != sel:
+            # the cached $(inputs.x) is only right while nothing was appended
+            sel, wrapped = typed_sel, None
+        if unsupported:
+            Logger.warn(
+                f"InputSelector {sel} is requesting to remove_file_extension but it has type {tinp.input_type.id()}"
+            )
 
-        intype = tinp.input_type
-        if selector.remove_file_extension:
-            if intype.is_base_type((File, Directory)):
-                potential_extensions = (
-                    intype.get_extensions() if intype.is_base_type(File) else None
-                )
-                if selector.remove_file_extension and potential_extensions:
-                    sel = f"{sel}.basename"
-                    for ext in potential_extensions:
-                        sel += f'.replace(/{ext}$/, "")'
+    if code_environment:
+        return sel
+    return wrapped or f"$({sel})"
 
-            elif intype.is_array() and isinstance(
-                intype.fundamental_type(), (File, Directory)
-            ):
-                inner_type = intype.fundamental_type()
-                extensions = (
-                    inner_type.get_extensions()
-                    if isinstance(inner_type, File)
-                    else None
-                )
 
-                inner_sel = f"el.basename"
-                if extensions:
-                    for ext in extensions:
-                        inner_sel += f'.replace(/{ext}$/, "")'
-                sel = f"{sel}.map(function(el) {{ return {inner_sel}; }})"
-            else:
-                Logger.warn(
-                    f"InputSelector {sel} is requesting to remove_file_extension but it has type {tinp.input_type.id()}"
-                )
-        elif tinp.localise_file:
-            if intype.is_base_type((File, Directory)):
-                sel += ".basename"
-            elif intype.is_array() and isinstance(
-                intype.fundamental_type(), (File, Directory)
-            ):
-                sel = f"{sel}.map(function(el) {{ return el.basename; }})"
-        elif add_path_suffix_if_required:
-            if intype.is_base_type((File, Directory)):
-                sel += ".path"
-            elif intype.is_array() and isinstance(
-                intype.fundamental_type(), (File, Directory)
-            ):
-                sel = f"{sel}.map(function(el) {{ return el.path; }})"
+@lru_cache(maxsize=4096)
+def input_reference(name: str) -> Tuple[str, str]:
+    """
+    Returns the (code, expression) references to the input 'name', as the same
+    input is usually selected from many places.
+    """
+    reference = f"inputs.{name}"
+    return reference, f"$({reference})"
 
-    return sel if code_environment else f"$({sel})"
+
+def reference_input_for_type(
+    sel: str,
+    intype: DataType,
+    remove_file_extension: bool,
+    localise_file: bool,
+    add_path_suffix_if_required: bool,
+) -> Tuple[str, bool]:
+    """
+    Extend the input reference 'sel' (eg: inputs.bam) with the basename / path
+    access required by its type. Not cached: DataTypes hash by class name and
+    compare by identity, so a cache keyed on them collides for every File input.
+
+    :return: (reference, whether remove_file_extension was unsupported for the type)
+    """
+    if remove_file_extension:
+        if intype.is_base_type((File, Directory)):
+            potential_extensions = (
+                intype.get_extensions() if intype.is_base_type(File) else None
+            )
+            if potential_extensions:
+                sel = f"{sel}.basename"
+                for ext in potential_extensions:
+                    sel += f'.replace(/{ext}$/, "")'
+
+        elif intype.is_array() and isinstance(
+            intype.fundamental_type(), (File, Directory)
+        ):
+            inner_type = intype.fundamental_type()
+            extensions = (
+                inner_type.get_extensions() if isinstance(inner_type, File) else None
+            )
+
+            inner_sel = f"el.basename"
+            if extensions:
+                for ext in extensions:
+                    inner_sel += f'.replace(/{ext}$/, "")'
+            sel = f"{sel}.map(function(el) {{ return {inner_sel}; }})"
+        else:
+            return sel, True
+    elif localise_file:
+        if intype.is_base_type((File, Directory)):
+            sel += ".basename"
+        elif intype.is_array() and isinstance(
+            intype.fundamental_type(), (File, Directory)
+        ):
+            sel = f"{sel}.map(function(el) {{ return el.basename; }})"
+    elif add_path_suffix_if_required:
+        if intype.is_base_type((File, Directory)):
+            sel += ".path"
+        elif intype.is_array() and isinstance(
+            intype.fundamental_type(), (File, Directory)
+        ):
+            sel = f"{sel}.map(function(el) {{ return el.path; }})"
+
+    return sel, False
+
+
+@lru_cache(maxsize=1024)
+def escaped_placeholder(key: str) -> str:
+    return re.escape("{" + key + "}")
+
+
+@lru_cache(maxsize=1024)
+def prepare_escaped_format(_format: str) -> str:
+    # formats are shared between the many steps / outputs using the same tool
+    return prepare_escaped_string(_format)
 
 
 def translate_string_formatter(
@@ -1904,19 +2110,33 @@ def translate_string_formatter(
     **debugkwargs,
 ):
 
-    escapedFormat = prepare_escaped_string(selector._format)
+    escapedFormat = prepare_escaped_format(selector._format)
 
     if len(selector.kwargs) == 0:
         return escapedFormat
 
-    kwargreplacements = [
-        f".replace(/{re.escape('{' +k + '}')}/g, {CwlTranslator.unwrap_expression(v, selector_override=selector_override, code_environment=True, tool=tool, inputs_dict=inputs_dict, **debugkwargs)})"
-        for k, v in selector.kwargs.items()
-    ]
-    expr = f'"{escapedFormat}"' + "".join(kwargreplacements)
+    # build the whole expression as one list of parts so it's joined exactly once
+    parts = ["" if code_environment else "$(", '"', escapedFormat, '"']
+    append = parts.append
+    unwrap = CwlTranslator.unwrap_expression
+    for k, v in selector.kwargs.items():
+        append(".replace(/")
+        append(escaped_placeholder(k))
+        append("/g, ")
+        append(
+            unwrap(
+                v,
+                selector_override=selector_override,
+                code_environment=True,
+                tool=tool,
+                inputs_dict=inputs_dict,
+                **debugkwargs,
+            )
+        )
+        append(")")
     if not code_environment:
-        expr = f"$({expr})"
-    return expr
+        append(")")
+    return "".join(parts)
 
 
 def translate_to_cwl_glob(glob, inputsdict, tool, **debugkwargs):
@@ -1934,72 +2154,26 @@ def translate_to_cwl_glob(glob, inputsdict, tool, **debugkwargs):
             None,
         )
 
+    handler = GLOB_HANDLERS_BY_TYPE.get(type(glob))
+    if handler is not None:
+        return handler(glob, inputsdict=inputsdict, tool=tool, **debugkwargs)
+
     if not isinstance(glob, Selector):
         return glob, None
 
     if isinstance(glob, InputSelector):
-
-        if glob.input_to_select:
-            if inputsdict is None or glob.input_to_select not in inputsdict:
-                raise Exception(
-                    "An internal error has occurred when generating the output glob for "
-                    + glob.input_to_select
-                )
-
-            tinp: ToolInput = inputsdict[glob.input_to_select]
-            intype = tinp.input_type
-            if isinstance(intype, Filename):
-                if isinstance(intype.prefix, Selector):
-                    return (
-                        intype.generated_filename(
-                            replacements={
-                                "prefix": CwlTranslator.unwrap_expression(
-                                    intype.prefix,
-                                    inputs_dict=inputsdict,
-                                    for_output=True,
-                                    code_environment=False,
-                                )
-                            }
-                        ),
-                        None,
-                    )
-                else:
-                    return intype.generated_filename(), None
-
-            expr = glob
-            if tinp.default:
-                expr = If(IsDefined(glob), expr, tinp.default)
-
-            return (
-                CwlTranslator.unwrap_expression(
-                    expr,
-                    inputs_dict=inputsdict,
-                    code_environment=False,
-                    for_output=True,
-                    **debugkwargs,
-                ),
-                None,
-            )
-
+        return translate_input_selector_glob(
+            glob, inputsdict=inputsdict, tool=tool, **debugkwargs
+        )
     elif isinstance(glob, StringFormatter):
-        return (
-            translate_string_formatter(glob, None, tool=tool, inputs_dict=inputsdict),
-            None,
+        return translate_string_formatter_glob(
+            glob, inputsdict=inputsdict, tool=tool, **debugkwargs
         )
-
     elif isinstance(glob, WildcardSelector):
-        return (
-            CwlTranslator.unwrap_expression(
-                glob.wildcard,
-                code_environment=False,
-                inputs_dict=inputsdict,
-                **debugkwargs,
-            ),
-            None,
+        return translate_wildcard_glob(
+            glob, inputsdict=inputsdict, tool=tool, **debugkwargs
         )
 
-        return glob.wildcard, None
-
     if isinstance(glob, Operator):
         # It's not terribly hard to do this, we'd have to change the output_eval
         # to use a combination of the presents_as AND
@@ -2031,55 +2205,239 @@ def translate_to_cwl_glob(glob, inputsdict, tool, **debugkwargs):
     raise Exception("Unimplemented selector type: " + glob.__class__.__name__)
 
 
+def translate_input_selector_glob(glob: InputSelector, inputsdict, tool, **debugkwargs):
+    if not glob.input_to_select:
+        raise Exception("Unimplemented selector type: " + glob.__class__.__name__)
+
+    if inputsdict is None or glob.input_to_select not in inputsdict:
+        raise Exception(
+            "An internal error has occurred when generating the output glob for "
+            + glob.input_to_select
+        )
+
+    tinp: ToolInput = inputsdict[glob.input_to_select]
+    intype = tinp.input_type
+    if isinstance(intype, Filename):
+        if isinstance(intype.prefix, Selector):
+            return (
+                intype.generated_filename(
+                    replacements={
+                        "prefix": CwlTranslator.unwrap_expression(
+                            intype.prefix,
+                            inputs_dict=inputsdict,
+                            for_output=True,
+                            code_environment=False,
+                        )
+                    }
+                ),
+                None,
+            )
+        else:
+            return intype.generated_filename(), None
+
+    expr = glob
+    if tinp.default:
+        expr = If(IsDefined(glob), expr, tinp.default)
+
+    return (
+        CwlTranslator.unwrap_expression(
+            expr,
+            inputs_dict=inputsdict,
+            code_environment=False,
+            for_output=True,
+            **debugkwargs,
+        ),
+        None,
+    )
+
+
+def translate_string_formatter_glob(
+    glob: StringFormatter, inputsdict, tool, **debugkwargs
+):
+    return (
+        translate_string_formatter(glob, None, tool=tool, inputs_dict=inputsdict),
+        None,
+    )
+
+
+def translate_wildcard_glob(glob: WildcardSelector, inputsdict, tool, **debugkwargs):
+    return (
+        CwlTranslator.unwrap_expression(
+            glob.wildcard,
+            code_environment=False,
+            inputs_dict=inputsdict,
+            **debugkwargs,
+        ),
+        None,
+    )
+
+
+def translate_plain_glob(glob, inputsdict, tool, **debugkwargs):
+    return glob, None
+
+
+# exact type lookup for common globs, subclasses go through translate_to_cwl_glob
+GLOB_HANDLERS_BY_TYPE = {
+    str: translate_plain_glob,
+    InputSelector: translate_input_selector_glob,
+    StringFormatter: translate_string_formatter_glob,
+    WildcardSelector: translate_wildcard_glob,
+}
+
+
+CPU_SELECTOR_EXPRESSION = sys.intern("$(inputs.runtime_cpu)")
+MEMORY_SELECTOR_EXPRESSION = sys.intern("$(Math.floor(inputs.runtime_memory))")
+
+
 def translate_cpu_selector(selector: CpuSelector):
-    return "$(inputs.runtime_cpu)"
+    return CPU_SELECTOR_EXPRESSION
 
 
 def translate_memory_selector(selector: MemorySelector):
-    return "$(Math.floor(inputs.runtime_memory))"
+    return MEMORY_SELECTOR_EXPRESSION
 
 
 ## OTHER HELPERS
 
 
+def collect_leaf_tools(wf) -> Dict[str, Tool]:
+    """
+    Collect the command and code tools used anywhere in 'wf' (including
+    subworkflows), keyed by versioned_id.
+    """
+    leaf_tools = {}
+    for s in wf.step_nodes.values():
+        tool = s.tool
+        if tool.type() == ToolType.Workflow:
+            for k, t in collect_leaf_tools(tool).items():
+                leaf_tools.setdefault(k, t)
+        elif isinstance(tool, (CommandTool, CodeTool)):
+            leaf_tools.setdefault(tool.versioned_id(), tool)
+    return leaf_tools
+
+
+def translate_leaf_tool(
+    tool,
+    with_container=True,
+    with_resource_overrides=False,
+    allow_empty_container=False,
+    container_override=None,
+):
+    # module level so it can be pickled into a worker process
+    if isinstance(tool, CodeTool):
+        return CwlTranslator.translate_code_tool_internal(
+            tool,
+            with_docker=with_container,
+            allow_empty_container=allow_empty_container,
+            container_override=container_override,
+        )
+    return CwlTranslator.translate_tool_internal(
+        tool,
+        with_container=with_container,
+        with_resource_overrides=with_resource_overrides,
+        allow_empty_container=allow_empty_container,
+        container_override=container_override,
+    )
+
+
+def build_workflow_requirements(wf):
+    requirements = [
+        get_marker_requirement(cwlgen.InlineJavascriptRequirement),
+        get_marker_requirement(cwlgen.StepInputExpressionRequirement),
+    ]
+    if wf.has_scatter:
+        requirements.append(get_marker_requirement(cwlgen.ScatterFeatureRequirement))
+    if wf.has_subworkflow:
+        requirements.append(
+            get_marker_requirement(cwlgen.SubworkflowFeatureRequirement)
+        )
+    if wf.has_multiple_inputs:
+        requirements.append(
+            get_marker_requirement(cwlgen.MultipleInputFeatureRequirement)
+        )
+    return requirements
+
+
 def build_resource_override_maps_for_workflow(
-    wf, prefix=None
+    wf, prefix=None, layouts: Dict[int, Tuple] = None
 ) -> List[cwlgen.InputParameter]:
     # returns a list of key, value pairs
+    prefix = prefix + "_" if prefix else ""  # wf.id() + "."
+    if layouts is None:
+        layouts = {}
+    loading_options = get_loading_options()
     inputs = []
-    if not prefix:
-        prefix = ""  # wf.id() + "."
-    else:
-        prefix += "_"
-
-    for s in wf.step_nodes.values():
-        tool: Tool = s.tool
 
-        if isinstance(tool, CommandTool):
-            tool_pre = prefix + s.id() + "_"
-            inputs.extend(
-                [
-                    cwlgen.CommandInputParameter(
-                        id=tool_pre + "runtime_memory", type="float?"
-                    ),
+    # depth-first over an explicit stack of (prefix, remaining steps), so every
+    # parameter is appended once into 'inputs' in the same order as a recursive walk
+    stack = [(prefix, iter(get_resource_override_layout(wf, layouts)))]
+    while stack:
+        current_prefix, steps = stack[-1]
+        for step_id, subworkflow in steps:
+            if subworkflow is None:
+                tool_pre = current_prefix + step_id + "_"
+                inputs.extend(
                     cwlgen.CommandInputParameter(
-                        id=tool_pre + "runtime_cpu", type="int?"
-                    ),
-                    cwlgen.CommandInputParameter(
-                        id=tool_pre + "runtime_disks", type="int?"
-                    ),
-                    cwlgen.CommandInputParameter(
-                        id=tool_pre + "runtime_seconds", type="int?"
-                    ),
-                ]
-            )
-        elif tool.type() == ToolType.Workflow:
-            tool_pre = prefix + s.id()
-            inputs.extend(build_resource_override_maps_for_workflow(tool, tool_pre))
+                        id=tool_pre + name,
+                        type=cwl_type,
+                        loadingOptions=loading_options,
+                    )
+                    for name, cwl_type in RESOURCE_OVERRIDE_INPUTS
+                )
+            else:
+                stack.append(
+                    (
+                        current_prefix + step_id + "_",
+                        iter(get_resource_override_layout(subworkflow, layouts)),
+                    )
+                )
+                break
+        else:
+            stack.pop()
 
     return inputs
 
 
+def get_resource_override_layout(
+    wf, layouts: Dict[int, Tuple]
+) -> Tuple[Tuple[str, Optional[Tool]], ...]:
+    """
+    Returns (step id, subworkflow or None for a CommandTool) for the steps of wf
+    that take resource overrides, memoized per (sub)workflow so one reused at
+    many steps is only inspected once.
+    """
+    key = id(wf)
+    if key not in layouts:
+        layout = []
+        for s in wf.step_nodes.values():
+            tool: Tool = s.tool
+            if isinstance(tool, CommandTool):
+                layout.append((s.id(), None))
+            elif tool.type() == ToolType.Workflow:
+                layout.append((s.id(), tool))
+        layouts[key] = tuple(layout)
+
+    return layouts[key]
+
+
+def group_resource_overrides_by_step(
+    resource_inputs: List[cwlgen.InputParameter], step_ids
+) -> Dict[str, Dict[str, str]]:
+    """
+    Map each step id to its {override_name: workflow_input_id} pairs, where
+    an override belongs to a step if its id is "{step_id}_{override_name}".
+    """
+    step_ids = set(step_ids)
+    overrides_by_step = {}
+    for r in resource_inputs:
+        parts = r.id.split("_")
+        for i in range(1, len(parts)):
+            step_id = "_".join(parts[:i])
+            if step_id in step_ids:
+                overrides_by_step.setdefault(step_id, {})["_".join(parts[i:])] = r.id
+    return overrides_by_step
+
+
 def prepare_filename_replacements_for(
     inp: Optional[Selector], inputsdict: Optional[Dict[str, ToolInput]]
 ) -> Optional[str]:
@@ -2100,30 +2458,31 @@ def prepare_filename_replacements_for(
 
         tinp = inputsdict.get(inp.input_to_select)
         intype = tinp.input_type
+        reference = f"inputs.{tinp.id()}"
 
         if intype.is_base_type((File, Directory)):
             potential_extensions = (
                 intype.get_extensions() if intype.is_base_type(File) else None
             )
             if inp.remove_file_extension and potential_extensions:
-                base = f"inputs.{tinp.id()}.basename"
+                base = f"{reference}.basename"
                 for ext in potential_extensions:
                     base += f'.replace(/{ext}$/, "")'
             elif tinp.localise_file:
-                base = f"inputs.{tinp.id()}.basename"
+                base = f"{reference}.basename"
             else:
-                base = f"inputs.{tinp.id()}"
+                base = reference
         elif (
             intype.is_array()
             and isinstance(intype.fundamental_type(), (File, Directory))
             and tinp.localise_file
         ):
-            base = f"inputs.{tinp.id()}.map(function(el) {{ return el.basename; }})"
+            base = f"{reference}.map(function(el) {{ return el.basename; }})"
         else:
-            base = "inputs." + tinp.id()
+            base = reference
 
         if intype.optional:
-            replacement = f'inputs.{tinp.id()} ? {base} : "generated"'
+            replacement = f'{reference} ? {base} : "generated"'
         else:
             replacement = f"{base}"
 
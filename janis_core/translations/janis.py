@@ -1,3 +1,4 @@
+from functools import lru_cache
 from itertools import groupby
 from typing import Tuple, Dict, Union, List, Set
 
@@ -28,6 +29,78 @@ from janis_core.tool.tool import Tool
 from janis_core.translations import TranslatorBase
 
 
+_MISSING = object()
+_NO_DEFAULT = object()
+
+
+@lru_cache(maxsize=None)
+def _get_init_fields(cls_) -> Tuple[Tuple[str, str, any], ...]:
+    """
+    inspect.signature is slow, so only compute the (field, attribute, default)
+    triples of a class's __init__ once per class, with its init_key_map applied.
+    """
+    param_map = {}
+    if not issubclass(cls_, (StepNode, WorkflowBase)):
+        param_map = getattr(cls_, "init_key_map", None) or {}
+
+    fields = []
+    for fkey, param in inspect.signature(cls_.__init__).parameters.items():
+        if fkey in ("self", "args", "kwargs"):
+            continue
+        t_key = param_map.get(fkey, fkey)
+        if t_key is None:
+            continue
+        default = param.default
+        if default is inspect.Parameter.empty:
+            default = _NO_DEFAULT
+        fields.append((fkey, t_key, default))
+
+    return tuple(fields)
+
+
+def _repr_list(obj, get_string_repr_func):
+    inner = ", ".join(map(get_string_repr_func, obj))
+    return f"[{inner}]"
+
+
+def _repr_dict(obj, get_string_repr_func):
+    inner = ", ".join(
+        f"{get_string_repr_func(k)}: {get_string_repr_func(v)}" for k, v in obj.items()
+    )
+    return f"{{{inner}}}"
+
+
+def _repr_str(obj, get_string_repr_func):
+    nlreplaced = obj.replace("\n", "\\n").replace('"', "'")
+    return f'"{nlreplaced}"'
+
+
+def _repr_scalar(obj, get_string_repr_func):
+    return str(obj)
+
+
+def _repr_datetime(obj, get_string_repr_func):
+    return f"datetime({obj.year}, {obj.month}, {obj.day})"
+
+
+def _repr_date(obj, get_string_repr_func):
+    return "None"
+
+
+# keyed on the exact type, subclasses fall through to the isinstance checks
+_STRING_REPR_DISPATCH = {
+    list: _repr_list,
+    dict: _repr_dict,
+    str: _repr_str,
+    int: _repr_scalar,
+    float: _repr_scalar,
+    bool: _repr_scalar,
+    type(None): _repr_scalar,
+    datetime: _repr_datetime,
+    date: _repr_date,
+}
+
+
 class HashOnlySet:
     """
     Keep adding anything hashable, but don't store duplicates if they're hash is the same
@@ -336,24 +409,21 @@ if __name__ == "__main__":
             get_string_repr_func or JanisTranslator.get_string_repr
         )(obj, workflow_id=workflow_id, get_string_repr_func=get_string_repr_func)
 
+        handler = _STRING_REPR_DISPATCH.get(type(obj))
+        if handler is not None:
+            return handler(obj, get_string_repr_func2)
+
+        # subclasses of the types in the dispatch table
         if isinstance(obj, list):
-            inner = ", ".join(map(get_string_repr_func2, obj))
-            return f"[{inner}]"
+            return _repr_list(obj, get_string_repr_func2)
         elif isinstance(obj, dict):
-            inner = ", ".join(
-                f"{get_string_repr_func2(k)}: {get_string_repr_func2(v)}"
-                for k, v in obj.items()
-            )
-            return f"{{{inner}}}"
+            return _repr_dict(obj, get_string_repr_func2)
         if isinstance(obj, str):
-            nlreplaced = obj.replace("\n", "\\n").replace('"', "'")
-            return f'"{nlreplaced}"'
-        elif isinstance(obj, (int, float, bool, type(None))):
-            return str(obj)
+            return _repr_str(obj, get_string_repr_func2)
+        elif isinstance(obj, (int, float, bool)):
+            return _repr_scalar(obj, get_string_repr_func2)
         elif isinstance(obj, datetime):
-            return f"datetime({obj.year}, {obj.month}, {obj.day})"
-        elif obj is None:
-            return "None"
+            return _repr_datetime(obj, get_string_repr_func2)
         elif isinstance(obj, Enum):
             return f"{obj.__class__.__name__}.{obj.name}"
         elif isinstance(obj, StringFormatter):
@@ -374,15 +444,11 @@ if __name__ == "__main__":
         elif isinstance(obj, InputSelector) and workflow_id:
             return f"{workflow_id}.{obj.input_to_select}"
         elif isinstance(obj, date):
-            return f"None"
+            return _repr_date(obj, get_string_repr_func2)
         elif isinstance(obj, UnionType):
             return f"UnionType({', '.join(map(get_string_repr_func2, obj.subtypes))})"
-        elif isinstance(
-            obj, object
-        ):  # any(isinstance(obj, T) for T in generic_convertible):
-            return JanisTranslator.convert_generic_class(obj)
 
-        return str(obj)
+        return JanisTranslator.convert_generic_class(obj)
 
     @staticmethod
     def convert_generic_class(
@@ -407,40 +473,28 @@ if __name__ == "__main__":
                 for k, v in t.init_dictionary().items()
             )
         else:
-            ignore_fields = set(
-                (ignore_fields if ignore_fields else []) + ["self", "args", "kwargs"]
-            )
-
-            params = inspect.signature(type(t).__init__).parameters
-            param_map = {}
-            if not isinstance(t, (StepNode, WorkflowBase)) and hasattr(
-                t, "init_key_map"
-            ):
-                param_map = t.init_key_map
-            # fields = fields_to_check if fields_to_check \
-            #     else [f for f in dict(params).keys() if f not in ignore_fields]
+            ignore_fields = set(ignore_fields) if ignore_fields else set()
 
-            for fkey in params:
+            for fkey, t_key, default in _get_init_fields(type(t)):
                 if fkey in ignore_fields:
                     continue
 
-                opts = params[fkey]
-
-                t_key = param_map.get(fkey, fkey)
-                if t_key is None:
-                    continue
-
-                if hasattr(t, t_key):
-                    v = t.__getattribute__(t_key)
-                else:
+                v = getattr(t, t_key, _MISSING)
+                if v is _MISSING:
                     Logger.warn(
                         f"Object '{t.__class__.__name__}' didn't have attribute {t_key}, setting to None and it might get skipped"
                     )
                     v = None
-                if (v is None and opts.default is None) or v == opts.default:
+                # only fall back to __eq__ for same-typed values, as comparing
+                # janis objects to the default could walk their whole tree
+                if v is default or (
+                    default is not _NO_DEFAULT
+                    and type(v) is type(default)
+                    and v == default
+                ):
                     continue
 
-                options.append(fkey + "=" + get_string_repr_func2(v))
+                options.append(f"{fkey}={get_string_repr_func2(v)}")
 
         return f"{t.__class__.__name__}({', '.join(options)})"
 
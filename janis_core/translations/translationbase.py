@@ -21,7 +21,11 @@ class TranslationError(Exception):
         # self.inner = inner
 
 
-kwargstoignore = {"container_override"}
+kwargstoignore = {
+    "container_override",
+    "translation_cache",
+    "resource_override_layouts",
+}
 
 
 def try_catch_translate(type):
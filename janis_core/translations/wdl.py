@@ -1383,7 +1383,7 @@ def translate_string_formatter_for_output(
     inputs_to_retranslate = {
         k: v
         for k, v in selector.kwargs.items()
-        if not any(isinstance(v, t) for t in StringFormatter.resolved_types)
+        if not isinstance(v, StringFormatter.resolved_types)
     }
 
     resolved_kwargs = {
@@ -2103,7 +2103,7 @@ def prepare_move_statements_for_output(
     if not (to.presents_as or to.secondaries_present_as):
         return commands
 
-    if not issubclass(type(ot), File):
+    if not isinstance(ot, File):
         Logger.critical(
             f"Janis has temporarily removed support for localising '{type(ot)}' types"
         )
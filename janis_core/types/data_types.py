@@ -195,6 +195,15 @@ class DataType(ABC):
             return f"Optional<{self.name()}>"
         return self.name()
 
+    def as_optional(self):
+        """
+        A shallow copy of this type that is optional (a cheaper copy.copy + set)
+        """
+        new = self.__class__.__new__(self.__class__)
+        new.__dict__ = self.__dict__.copy()
+        new.optional = True
+        return new
+
     @abstractmethod
     def validate_value(self, meta: Any, allow_null_if_not_optional: bool) -> bool:
         pass
@@ -1,9 +1,13 @@
+import re
 from keyword import iskeyword
 from typing import Tuple, List
 
 from janis_core.utils.logger import Logger
 
 
+_BRACE_RE = re.compile(r"[{}]")
+
+
 # https://stackoverflow.com/a/36331242/2860731
 def variable_name_validator(x: str):
     return x.isidentifier() and not iskeyword(x)
@@ -19,10 +23,11 @@ def get_keywords_between_braces(
     rejected = set()
     skipped = set()
 
-    for i in range(len(text)):
-
-        char = text[i]
-        if char == "{" and (i < 0 or text[i-1] != "$"):
+    # only the braces affect the state, so skip straight between them
+    for brace in _BRACE_RE.finditer(text):
+        i = brace.start()
+        char = brace.group()
+        if char == "{" and (i == 0 or text[i - 1] != "$"):
             counter += 1
             highest_level = max(highest_level, counter)
             if start_idx is None:
@@ -45,6 +45,10 @@ class ConflictingArgumentsException(Exception):
     pass
 
 
+class MissingDependencyException(Exception):
+    pass
+
+
 def deprecated(message):
     def deprecated_decorator(func):
         def deprecated_func(*args, **kwargs):
@@ -44,18 +44,27 @@ from janis_core.utils.validators import Validators
 
 ConnectionSource = Union[Node, StepOutputSelector, Tuple[Node, str]]
 
+# sources that are already selectors, matched on the exact type before falling
+# back to the isinstance checks (which also accept subclasses)
+PASSTHROUGH_SOURCE_TYPES = (
+    StepOutputSelector,
+    InputNodeSelector,
+    AliasSelector,
+    ForEachSelector,
+)
+
 
 def verify_or_try_get_source(
     source: Union[ConnectionSource, List[ConnectionSource]]
 ) -> Union[StepOutputSelector, InputNodeSelector, List[StepOutputSelector], Operator]:
 
-    if isinstance(source, StepOutputSelector):
+    source_type = type(source)
+    if source_type in PASSTHROUGH_SOURCE_TYPES:
         return source
-    elif isinstance(source, InputNodeSelector):
-        return source
-    elif isinstance(source, AliasSelector):
-        return source
-    elif isinstance(source, ForEachSelector):
+    elif source_type is list:
+        return [verify_or_try_get_source(s) for s in source]
+
+    if isinstance(source, PASSTHROUGH_SOURCE_TYPES):
         return source
     elif isinstance(source, list):
         return [verify_or_try_get_source(s) for s in source]
@@ -77,7 +86,7 @@ def verify_or_try_get_source(
             raise Exception(
                 f"Too many outputs of {node.id()} to guess the correct output"
             )
-        tag = list(outs.keys())[0]
+        tag = next(iter(outs), None)
 
     if tag not in outs:
         tags = ", ".join([f"out.{o}" for o in outs.keys()])
@@ -126,7 +135,11 @@ class StepNode(Node):
         scatter: ScatterDescription = None,
         when: Operator = None,
         _foreach=None,
+        inputs_map: Dict[str, TInput] = None,
     ):
+        """
+        :param inputs_map: the tool's inputs_map() if the caller already built it
+        """
         super().__init__(wf, NodeType.STEP, identifier)
         self.tool = tool
         self.doc = doc
@@ -137,7 +150,26 @@ class StepNode(Node):
         self.parent_has_conditionals = False
         self.has_conditionals = when is not None
 
+        # (key, map) of the last inputs() / outputs(), where the key is the tool
+        # identity, conditional flags and the size of a workflow tool's nodes
+        self._inputs_cache = None
+        self._outputs_cache = None
+        if inputs_map is not None:
+            self._inputs_cache = (self._maps_cache_key(), inputs_map)
+
+    def _maps_cache_key(self):
+        tool = self.tool
+        key = (id(tool), self.parent_has_conditionals, self.has_conditionals)
+        if isinstance(tool, WorkflowBase):
+            # a workflow can still gain inputs / outputs after it's been stepped
+            return key + (len(tool.input_nodes), len(tool.output_nodes))
+        return key
+
     def inputs(self) -> Dict[str, TInput]:
+        key = self._maps_cache_key()
+        if self._inputs_cache is not None and self._inputs_cache[0] == key:
+            return self._inputs_cache[1]
+
         ins = self.tool.inputs_map()
 
         # if self.parent_has_conditionals:
@@ -151,20 +183,30 @@ class StepNode(Node):
         #
         #     ins = q
 
+        self._inputs_cache = (key, ins)
         return ins
 
     def outputs(self) -> Dict[str, TOutput]:
+        key = self._maps_cache_key()
+        if self._outputs_cache is not None and self._outputs_cache[0] == key:
+            return self._outputs_cache[1]
+
         outs = self.tool.outputs_map()
 
-        if self.has_conditionals:
+        # if every output is already optional, the tool's map can be used as is
+        if self.has_conditionals and not all(
+            ov.outtype.optional for ov in outs.values()
+        ):
             q = {}
             for ov in outs.values():
-                outtype = copy.copy(ov.outtype)
-                outtype.optional = True
+                outtype = ov.outtype
+                if not outtype.optional:
+                    outtype = outtype.as_optional()
                 q[ov.id()] = TOutput(ov.id(), outtype=outtype, doc=ov.doc)
 
             outs = q
 
+        self._outputs_cache = (key, outs)
         return outs
 
     def _add_edge(self, tag: str, source: ConnectionSource):
@@ -186,9 +228,13 @@ class StepNode(Node):
         return self.sources[tag].add_source(source, should_scatter=scatter)
 
     def __getattr__(self, item):
-        if item in self.__dict__:
-            return self.__dict__[item]
-
+        # only called once the normal lookup (including __dict__) has failed
+        if item.startswith("_"):
+            # identifiers start with a letter, so this is something like pickle
+            # looking up __setstate__ (before __dict__ has even been restored)
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{item}'"
+            )
         return self.get_item(item)
 
     def __getitem__(self, item) -> StepOutputSelector:
@@ -243,27 +289,32 @@ class OutputNode(Node):
         sources = source if isinstance(source, list) else [source]
         single_source = sources[0]
 
-        if isinstance(single_source, StepOutputSelector):
-            snode = single_source.node
-            stype = snode.outputs()[single_source.tag].outtype
-            if snode.scatter:
-                stype = Array(stype)
-        elif isinstance(single_source, Selector):
-            stype = single_source.returntype()
-        else:
+        if not isinstance(single_source, Selector):
             raise Exception("Unsupported output source type " + str(single_source))
 
-        if not skip_typecheck and not datatype.can_receive_from(stype):
-            if isinstance(source, list):
-                source_str = (
-                    "['" + "', '".join(f"{s.node.id()}.{s.tag}" for s in source) + "']"
-                )
+        # the source type is only needed to check it against a given datatype
+        if not skip_typecheck:
+            if isinstance(single_source, StepOutputSelector):
+                snode = single_source.node
+                stype = snode.outputs()[single_source.tag].outtype
+                if snode.scatter:
+                    stype = Array(stype)
             else:
-                source_str = f"'{source.node.id()}.{source.tag}'"
-            Logger.critical(
-                f"Mismatch of types when joining to output node {source_str} to '{identifier}' "
-                f"({stype.id()} -/→ {datatype.id()})"
-            )
+                stype = single_source.returntype()
+
+            if not datatype.can_receive_from(stype):
+                if isinstance(source, list):
+                    source_str = (
+                        "['"
+                        + "', '".join(f"{s.node.id()}.{s.tag}" for s in source)
+                        + "']"
+                    )
+                else:
+                    source_str = f"'{source.node.id()}.{source.tag}'"
+                Logger.critical(
+                    f"Mismatch of types when joining to output node {source_str} to '{identifier}' "
+                    f"({stype.id()} -/→ {datatype.id()})"
+                )
 
         self.source = verify_or_try_get_source(source)
         self.doc = (
@@ -312,15 +363,18 @@ class WorkflowBase(Tool):
     def friendly_name(self):
         pass
 
-    def verify_identifier(self, identifier: str, component: str):
+    def verify_identifier(self, identifier: str, component):
+        """
+        :param component: what's being added, only formatted (with str) for an error
+        """
 
         if identifier in self.__dict__:
             raise Exception(
                 f"'{identifier}' is a protected keyword for a janis workflow"
             )
 
-        if identifier in self.nodes:
-            existing = self.nodes[identifier]
+        existing = self.nodes.get(identifier)
+        if existing is not None:
             raise Exception(
                 f"There already exists a node (and component) with id '{identifier}'. The added "
                 f"component ('{component}') clashes with '{repr(existing)}')."
@@ -344,7 +398,7 @@ class WorkflowBase(Tool):
         :return:
         """
 
-        self.verify_identifier(identifier, repr(datatype))
+        self.verify_identifier(identifier, datatype)
 
         datatype = get_instantiated_type(datatype)
         if default is not None:
@@ -398,7 +452,7 @@ class WorkflowBase(Tool):
             from the inherited data type (eg: CSV -> ".csv"), or it will attempt to pull the extension from the file.
         :return: janis.WorkflowOutputNode
         """
-        self.verify_identifier(identifier, repr(datatype))
+        self.verify_identifier(identifier, datatype)
 
         if source is None:
             raise Exception("Output source must not be 'None'")
@@ -616,9 +670,10 @@ class WorkflowBase(Tool):
     def all_input_keys(self):
         from janis_core.translations.translationbase import TranslatorBase
 
-        return super().all_input_keys() + list(
-            TranslatorBase.build_resources_input(tool=self, hints={}).keys()
-        )
+        return [
+            *super().all_input_keys(),
+            *TranslatorBase.build_resources_input(tool=self, hints={}),
+        ]
 
     def verify_output_source_type(
         self,
@@ -719,34 +774,27 @@ class WorkflowBase(Tool):
                 f"Can't supply 'scatter' and 'foreach' value to step with id: {identifier} for tool: {tool.id()}"
             )
 
+        inputs = tool.inputs_map()
+        # the key views support the set operations below without building sets
+        all_keys = inputs.keys()
+
         # verify scatter
         if scatter:
-            ins = set(tool.inputs_map().keys())
-            fields = set(scatter.fields)
-            if any(f not in ins for f in fields):
+            extra_fields = set(scatter.fields).difference(all_keys)
+            if extra_fields:
                 # if there is a field not in the input map, we have a problem
-                extra_keys = ", ".join(f"'{f}'" for f in (fields - ins))
+                extra_keys = ", ".join(f"'{f}'" for f in extra_fields)
                 raise Exception(
                     f"Couldn't scatter the field(s) {extra_keys} for step '{identifier}' "
                     f"as they are not inputs to the tool '{tool.id()}'"
                 )
 
         tool.workflow = self
-        inputs = tool.inputs_map()
-
         connections = tool.connections
 
-        provided_keys = set(connections.keys())
-        all_keys = set(inputs.keys())
-        required_keys = set(
-            # The input is optional if it's optional or has default)
-            i
-            for i, v in inputs.items()
-            if not (v.intype.optional or v.default is not None)
-        )
-
-        if not provided_keys.issubset(all_keys):
-            unrecparams = ", ".join(provided_keys - all_keys)
+        unrecognised_keys = connections.keys() - all_keys
+        if unrecognised_keys:
+            unrecparams = ", ".join(unrecognised_keys)
 
             tags = ", ".join([f"in.{i}" for i in all_keys])
 
@@ -755,11 +803,19 @@ class WorkflowBase(Tool):
                 f"Expected types: {tags}"
             )
 
-        if not ignore_missing and not required_keys.issubset(provided_keys):
-            missing = ", ".join(f"'{i}'" for i in (required_keys - provided_keys))
-            raise Exception(
-                f"Missing the parameters {missing} when creating '{identifier}' ({tool.id()})"
-            )
+        if not ignore_missing:
+            missing_keys = [
+                # The input is optional if it's optional or has default)
+                i
+                for i, v in inputs.items()
+                if i not in connections
+                and not (v.intype.optional or v.default is not None)
+            ]
+            if missing_keys:
+                missing = ", ".join(f"'{i}'" for i in missing_keys)
+                raise Exception(
+                    f"Missing the parameters {missing} when creating '{identifier}' ({tool.id()})"
+                )
 
         d = doc if isinstance(doc, DocumentationMeta) else DocumentationMeta(doc=doc)
         stp = StepNode(
@@ -770,15 +826,22 @@ class WorkflowBase(Tool):
             when=when,
             doc=d,
             _foreach=_foreach,
+            inputs_map=inputs,
         )
 
         added_edges = []
         for (k, v) in connections.items():
 
+            if type(v) in PASSTHROUGH_SOURCE_TYPES:
+                # already a selector (the usual case), so nothing to wrap or verify
+                added_edges.append(stp._add_edge(k, v))
+                continue
+
+            tinput = inputs[k]
             isfilename = isinstance(v, Filename)
             if is_python_primitive(v) or isfilename:
                 inp_identifier = f"{identifier}_{k}"
-                referencedtype = copy.copy(inputs[k].intype) if not isfilename else v
+                referencedtype = copy.copy(tinput.intype) if not isfilename else v
                 parsed_type = get_instantiated_type(v)
 
                 if parsed_type and not referencedtype.can_receive_from(parsed_type):
@@ -789,7 +852,7 @@ class WorkflowBase(Tool):
 
                 referencedtype.optional = True
 
-                indoc = inputs[k].doc
+                indoc = tinput.doc
                 indoc.quality = InputQualityType.configuration
 
                 v = self.input(
@@ -800,21 +863,24 @@ class WorkflowBase(Tool):
                 )
             if v is None:
                 inp_identifier = f"{identifier}_{k}"
-                doc = copy.copy(InputDocumentation.try_parse_from(inputs[k].doc))
+                doc = copy.copy(InputDocumentation.try_parse_from(tinput.doc))
                 doc.quality = InputQualityType.configuration
-                v = self.input(inp_identifier, inputs[k].intype, default=v, doc=doc)
+                v = self.input(inp_identifier, tinput.intype, default=v, doc=doc)
 
             verifiedsource = verify_or_try_get_source(v)
-            if isinstance(verifiedsource, list):
+            if type(verifiedsource) is list:
                 for vv in verifiedsource:
                     added_edges.append(stp._add_edge(k, vv))
             else:
                 added_edges.append(stp._add_edge(k, verifiedsource))
 
-        for e in added_edges:
-
-            si = e.finish.sources[e.ftag] if e.ftag else first_value(e.finish.sources)
-            self.has_multiple_inputs = self.has_multiple_inputs or si.multiple_inputs
+        if not self.has_multiple_inputs:
+            for e in added_edges:
+                sources = e.finish.sources
+                si = sources[e.ftag] if e.ftag else first_value(sources)
+                if si.multiple_inputs:
+                    self.has_multiple_inputs = True
+                    break
 
         self.has_scatter = (
             self.has_scatter or scatter is not None or _foreach is not None
@@ -845,18 +911,17 @@ class WorkflowBase(Tool):
 
         # check output schema
         compare_schema = tools[0].outputs_map()
-        in_keys = set(compare_schema.keys())
         non_matching_tools = []
-        for i in range(1, len(tools)):
-            tool = tools[i]
+        for tool in tools[1:]:
             outs = tool.outputs_map()
-            extra_params = set(outs.keys()) - in_keys
-            non_matching_els = list(
+            non_matching_els = [
                 k
                 for k, v in compare_schema.items()
                 if k not in outs or not v.outtype.can_receive_from(outs[k].outtype)
-            )
-            if len(non_matching_els) > 0:
+            ]
+            if non_matching_els:
+                # the extra keys are only reported alongside a mismatch
+                extra_params = outs.keys() - compare_schema.keys()
                 non_matching_tools.append(
                     tool.id() + ": " + ", ".join(non_matching_els + list(extra_params))
                 )
@@ -872,8 +937,10 @@ class WorkflowBase(Tool):
         self.step(stepid, w)
 
     def __getattr__(self, item):
-        if item in self.__dict__ or item == "nodes":
-            return self.__dict__.get(item)
+        # only called once the normal lookup (including __dict__) has failed, and
+        # 'nodes' may not be set yet (eg: when unpickling) so don't recurse on it
+        if item == "nodes":
+            return None
 
         try:
             return self.__getitem__(item)
@@ -980,23 +1047,25 @@ class WorkflowBase(Tool):
         """
         ad = additional_inputs or {}
 
-        d = {
-            i.id(): ad.get(i.id(), i.value or i.default)
-            for i in self.input_nodes.values()
+        d = {}
+        for i in self.input_nodes.values():
+            iid = i.id()
             if (
-                i.id() in ad
-                or i.value
-                or not i.datatype.optional
-                or (i.default and include_defaults)
-            )
-            and not (values_to_ignore and i.id() in values_to_ignore)
-            and (not (i.doc and quality_type) or i.doc.quality in quality_type)
-        }
+                (
+                    iid in ad
+                    or i.value
+                    or not i.datatype.optional
+                    or (i.default and include_defaults)
+                )
+                and not (values_to_ignore and iid in values_to_ignore)
+                and (not (i.doc and quality_type) or i.doc.quality in quality_type)
+            ):
+                d[iid] = ad.get(iid, i.value or i.default)
 
         if with_resource_overrides:
             from janis_core.translations import CwlTranslator
 
-            d.update(CwlTranslator().build_resources_input(self, hints))
+            d.update(CwlTranslator.build_resources_input(self, hints))
 
         return d
 
@@ -1014,11 +1083,21 @@ class WorkflowBase(Tool):
         return tr
 
     def get_tools(self) -> Dict[str, CommandTool]:
+        return self._collect_tools({})
+
+    def _collect_tools(
+        self, subworkflow_tools: Dict[int, Dict[str, CommandTool]]
+    ) -> Dict[str, CommandTool]:
+        # subworkflow_tools is shared through the whole walk, so a subworkflow
+        # that's used at several steps (at any depth) is only walked once
         tools: Dict[str, CommandTool] = {}
         for t in self.step_nodes.values():
             tl = t.tool
             if isinstance(tl, WorkflowBase):
-                tools.update(tl.get_tools())
+                key = id(tl)
+                if key not in subworkflow_tools:
+                    subworkflow_tools[key] = tl._collect_tools(subworkflow_tools)
+                tools.update(subworkflow_tools[key])
             elif t.id() not in tools:
                 tools[tl.id()] = tl
         return tools
@@ -1049,7 +1128,7 @@ class WorkflowBase(Tool):
         import tabulate
 
         tools = self.get_tools()
-        keys = sorted(tools.keys(), key=lambda a: a[0].lower())
+        keys = sorted(tools, key=str.lower)
 
         header = ["tool", "version", "container"]
         data = []
@@ -1082,12 +1161,11 @@ class WorkflowBase(Tool):
         header = ["name", "cpu", "memory (GB)"]
         data = []
 
-        for t in sorted(tools.keys()):
+        # tools are keyed by id, so sort the rows once by the (lowercased) id
+        for t in sorted(tools, key=lambda k: (k.lower(), k)):
             tool = tools[t]
             data.append([tool.id(), tool.cpus(hints), tool.memory(hints)])
 
-        data.sort(key=lambda a: a[0].lower())
-
         data.insert(0, header)
 
         if to_console:
@@ -1392,20 +1470,39 @@ class WorkflowBuilder(Workflow):
         return self._doc
 
 
-def wrap_steps_in_workflow(
-    stepId: str, steps: List[Union[Tuple[Operator, Tool], Tool]]
-):
-    # skip validation of steps
-
-    # need to resolve connections and try to map them to the same
+class SwitchConditionRebuilder:
+    """
+    Rebuilds the conditions of a switch for the workflow 'w' that wraps its cases,
+    swapping the step outputs / inputs they select for inputs of w. Each swapped
+    source is recorded in connection_map (w's input id -> source).
+    """
 
-    w = WorkflowBuilder(stepId)
-    workflow_connection_map = {}
+    def __init__(self, w: WorkflowBase, connection_map: Dict[str, Any]):
+        self.input_nodes = w.input_nodes
+        self.add_input = w.input
+        self.connection_map = connection_map
+        # id(operator) -> (operator, rebuilt operator), as an operator can be shared
+        # by several conditions. The operator is kept so its id can't be reused.
+        self.rebuilt: Dict[int, Tuple[Operator, Operator]] = {}
 
-    def rebuild_condition(operator: Operator):
+    def rebuild(self, operator: Operator):
         if operator is None:
             return None
 
+        key = id(operator)
+        cached = self.rebuilt.get(key)
+        if cached is not None:
+            return cached[1]
+
+        rebuilt = self.rebuild_uncached(operator)
+        self.rebuilt[key] = (operator, rebuilt)
+        return rebuilt
+
+    def rebuild_uncached(self, operator: Operator):
+        rebuild = REBUILD_CONDITION_BY_TYPE.get(type(operator))
+        if rebuild is not None:
+            return rebuild(self, operator)
+
         if not isinstance(operator, Selector):
             return operator
 
@@ -1413,48 +1510,94 @@ def wrap_steps_in_workflow(
         # ensure traversal through StringFormatters to looking for the same thing
 
         if isinstance(operator, StepOutputSelector):
-            # pipe in the input of the step_operator
-            identifier = f"cond_{operator.node.id()}_{operator.tag}"
-            if identifier in w.step_nodes:
-                return w[identifier]
-            else:
-                workflow_connection_map[identifier] = operator
-                return w.input(
-                    identifier, operator.node.outputs()[operator.tag].outtype
-                )
+            return self.rebuild_step_output(operator)
         if isinstance(operator, InputNodeSelector):
-            identifier = f"cond_{operator.input_node.id()}"
-            if identifier in w.input_nodes:
-                return w[identifier]
-            else:
-                innode: InputNode = operator.input_node
-                workflow_connection_map[identifier] = operator
-                return w.input(identifier, first_value(innode.outputs()).outtype)
+            return self.rebuild_input_node(operator)
 
         if isinstance(operator, StringFormatter):
-            return StringFormatter(
-                operator._format,
-                **{k: rebuild_condition(v) for k, v in operator.kwargs.items()},
-            )
+            return self.rebuild_string_formatter(operator)
 
         if isinstance(operator, Operator):
-            return operator.__class__(*[rebuild_condition(t) for t in operator.args])
+            return self.rebuild_operator(operator)
 
         # if isinstance(operator, SingleValueOperator):
-        #     return operator.__class__(rebuild_condition(operator.internal))
+        #     return operator.__class__(self.rebuild(operator.internal))
         #
         # if isinstance(operator, TwoValueOperator):
         #     return operator.__class__(
-        #         rebuild_condition(operator.lhs), rebuild_condition(operator.rhs)
+        #         self.rebuild(operator.lhs), self.rebuild(operator.rhs)
         #     )
 
         return operator
 
+    def rebuild_step_output(self, operator: StepOutputSelector):
+        # pipe in the input of the step_operator
+        identifier = f"cond_{operator.node.id()}_{operator.tag}"
+        existing = self.input_nodes.get(identifier)
+        if existing is not None:
+            return existing.as_operator()
+        self.connection_map[identifier] = operator
+        return self.add_input(identifier, operator.node.outputs()[operator.tag].outtype)
+
+    def rebuild_input_node(self, operator: InputNodeSelector):
+        identifier = f"cond_{operator.input_node.id()}"
+        existing = self.input_nodes.get(identifier)
+        if existing is not None:
+            return existing.as_operator()
+        innode: InputNode = operator.input_node
+        self.connection_map[identifier] = operator
+        return self.add_input(identifier, first_value(innode.outputs()).outtype)
+
+    def rebuild_string_formatter(self, operator: StringFormatter):
+        opkwargs = operator.kwargs
+        if not opkwargs:
+            # constant formatter, there's nothing inside it to swap out
+            return operator
+
+        kwargs = {k: self.rebuild(v) for k, v in opkwargs.items()}
+        if all(kwargs[k] is v for k, v in opkwargs.items()):
+            # nothing was swapped out, so the formatter can be used as is
+            return operator
+
+        # same format and keys, so skip parsing and validating the format again
+        return StringFormatter._from_prevalidated(
+            operator._format, operator._keywords, operator._balance, kwargs
+        )
+
+    def rebuild_operator(self, operator: Operator):
+        args = [self.rebuild(t) for t in operator.args]
+        if all(a is t for a, t in zip(args, operator.args)):
+            # nothing was swapped out, so the operator can be used as is
+            return operator
+
+        return operator.__class__(*args)
+
+
+# exact type lookup for the selectors, subclasses go through the isinstance checks
+REBUILD_CONDITION_BY_TYPE = {
+    StepOutputSelector: SwitchConditionRebuilder.rebuild_step_output,
+    InputNodeSelector: SwitchConditionRebuilder.rebuild_input_node,
+    StringFormatter: SwitchConditionRebuilder.rebuild_string_formatter,
+}
+
+
+def wrap_steps_in_workflow(
+    stepId: str, steps: List[Union[Tuple[Operator, Tool], Tool]]
+):
+    # skip validation of steps
+
+    # need to resolve connections and try to map them to the same
+
+    w = WorkflowBuilder(stepId)
+    workflow_connection_map = {}
+    add_input = w.input
+    rebuild_condition = SwitchConditionRebuilder(w, workflow_connection_map).rebuild
+
     prevconds: List[Operator] = []
+    case_steps: List[StepNode] = []
 
-    for i in range(len(steps)):
-        step = steps[i]
-        stepid = "switch_case_" + str(i + 1)
+    for i, step in enumerate(steps, start=1):
+        stepid = f"switch_case_{i}"
 
         if isinstance(step, tuple):
             newcond = rebuild_condition(step[0])
@@ -1472,27 +1615,23 @@ def wrap_steps_in_workflow(
 
         toolinputs = tool.inputs_map()
         connection_map = {}
-        for (k, v) in tool.connections.items():
-
-            # unique
-            identifier = stepid + "_" + k
-
+        for k, v in tool.connections.items():
             if is_python_primitive(v):
                 # the add step will create the literal for us
                 connection_map[k] = v
             else:
-                # generate an input for this step, of whatever type our tool wants
+                # generate a (unique) input for this step, of whatever type our tool wants
+                identifier = f"{stepid}_{k}"
                 toolin = toolinputs[k]
                 workflow_connection_map[identifier] = v
-                connection_map[k] = w.input(identifier, toolin.intype, doc=toolin.doc)
+                connection_map[k] = add_input(identifier, toolin.intype, doc=toolin.doc)
 
-        w.step(stepid, tool(**connection_map), when=cond)
+        case_steps.append(w.step(stepid, tool(**connection_map), when=cond))
 
-    steps = list(w.step_nodes.values())
-    # They should all have exact same contract
-    outputs = steps[0].tool.outputs_map().values()
-    for o in outputs:
-        out_source = [stp[o.id()] for stp in steps]
-        w.output(o.id(), source=FirstOperator(out_source))
+    # They should all have exact same contract. StepNode.outputs() is memoized (and
+    # used by StepOutputSelector), so this doesn't rebuild the tool's outputs map
+    for oid in case_steps[0].outputs():
+        out_source = [StepOutputSelector(stp, oid) for stp in case_steps]
+        w.output(oid, source=FirstOperator(out_source))
 
     return w(**workflow_connection_map)